@@ -1,12 +1,24 @@
 import os
+import sys
+import shutil
+import subprocess
 import numpy as np
 import pandas as pd
 import pytest
+import matplotlib.pyplot as plt
+from scipy.stats import chi2_contingency, fisher_exact, shapiro, pearsonr, spearmanr, rankdata
+from scipy import sparse
 from python.relis_statistics_kernel import (
     NominalVariables, ContinuousVariables, Policies,
-    NominalDataFrame, ContinuousDataFrame,
-    _aggregate_variables_by_data_type, _transform_classification_data,
-    _substitute_nan
+    NominalDataFrame, ContinuousDataFrame, DataCache,
+    _aggregate_variables_by_data_type, _transform_classification_data, _transform_continuous_data,
+    _substitute_nan, _freeze_dataframe, _build_multivalue_index, _nominal_dataframe, _continuous_dataframe,
+    _desc_frequency_tables, _read_contingency_tables, _read_chi_squared_tests, _trim_contingency_table,
+    _read_shapiro_wilk_test, _correlation_matrix, _build_descriptive_statistics, render_figures, main,
+    _top_categories, _kept_categories, _fold_categories, _fold_frequency_table, _fold_contingency_table,
+    _desc_frequency_table, _comp_frequency_table,
+    _small_expected_frequencies, _fisher_test, _monte_carlo_fisher_test, _comp_chi_squared_test, _comp_chi_squared_matrix,
+    _build_execution_plan, _execute_plan, _read_evolution_tables, _window_frequencies, _desc_bar_plot, _comp_bubble_chart, _display_figure
 )
 
 ### Testing
@@ -15,6 +27,8 @@ CURRENT_FILE_PATH = os.path.abspath(__file__)
 
 TEST_ROOT_DIRECTORY = os.path.dirname(CURRENT_FILE_PATH)
 
+CLASSIFICATION_DATA_PATH = f'{TEST_ROOT_DIRECTORY}/data/relis_classification_CV.csv'
+
 AGGREGATED_NOMINAL_VARIABLES = {'Venue': 'venue',
                                 'Search Type': 'search_type',
                                 'Domain': 'domain',
@@ -28,9 +42,14 @@ AGGREGATED_NOMINAL_VARIABLES = {'Venue': 'venue',
 AGGREGATED_CONTINUOUS_VARIABLES = {'Publication year': 'publication_year',
                                     'Targeted year': 'targeted_year'}
 
+@pytest.fixture(autouse=True)
+def shared_data_cache(monkeypatch):
+    # Only test_data_cache_store writes a columnar store, the source tree is left untouched
+    monkeypatch.setattr('python.relis_statistics_kernel.data_cache.store', False)
+
 @pytest.fixture
 def project_classification_data():
-    return pd.read_csv(f'{TEST_ROOT_DIRECTORY}/data/relis_classification_CV.csv', encoding='utf8')
+    return pd.read_csv(CLASSIFICATION_DATA_PATH, encoding='utf8')
 
 @pytest.fixture
 def project_classification_nominal_data():
@@ -88,6 +107,204 @@ def test_load_classification_data(project_classification_data: pd.DataFrame):
     # Assert that classification header contains the publication year
     assert(hasattr(project_classification_data, 'Publication year'))
 
+def test_data_cache_reload(tmp_path):
+    file_path = str(tmp_path / 'relis_classification.csv')
+    shutil.copy(CLASSIFICATION_DATA_PATH, file_path)
+    data_cache = DataCache(store=False)
+
+    data = data_cache.load_csv(file_path, 'utf8')
+    assert data_cache.load_csv(file_path, 'utf8') is data
+    assert data_cache.stats()['hits'] == 1 and data_cache.stats()['misses'] == 1
+
+    # Assert that touching the file keeps the cached data
+    os.utime(file_path, ns=(0, 0))
+    assert data_cache.load_csv(file_path, 'utf8') is data
+
+    # Assert that a re-export is parsed again
+    pd.read_csv(CLASSIFICATION_DATA_PATH).head(3).to_csv(file_path, index=False)
+    assert len(data_cache.load_csv(file_path, 'utf8')) == 3
+
+    data_cache.invalidate(file_path)
+    assert data_cache.stats()['entries'] == 0
+
+def test_data_cache_eviction(tmp_path):
+    file_paths = [str(tmp_path / f'relis_classification_{i}.csv') for i in range(3)]
+    for file_path in file_paths:
+        shutil.copy(CLASSIFICATION_DATA_PATH, file_path)
+    data_cache = DataCache(memory_budget=1, store=False)
+
+    # Assert that only the most recently used file is kept within the budget
+    for file_path in file_paths:
+        data_cache.load_csv(file_path, 'utf8')
+    assert list(data_cache.entries) == [os.path.abspath(file_paths[-1])]
+    assert data_cache.stats()['bytes'] > 0
+
+def test_data_cache_store(tmp_path, continuous_variables):
+    file_path = str(tmp_path / 'relis_classification.csv')
+    shutil.copy(CLASSIFICATION_DATA_PATH, file_path)
+
+    cold_cache = DataCache()
+    continuous_data = cold_cache.load_dataframe(file_path, 'utf8', continuous_variables, ContinuousDataFrame).data
+    indexes = cold_cache.load_multivalue_indexes(file_path, 'utf8')
+    assert os.path.isdir(tmp_path / '.relis_cache')
+
+    # Assert that a warm start restores the same data without parsing the classification file
+    warm_cache = DataCache()
+    assert warm_cache.load_dataframe(file_path, 'utf8', continuous_variables, ContinuousDataFrame).data.equals(continuous_data)
+    for field_name, index in warm_cache.load_multivalue_indexes(file_path, 'utf8').items():
+        assert (index.codes == indexes[field_name].codes).all()
+        assert (index.categories == indexes[field_name].categories).all()
+    assert warm_cache.entries[os.path.abspath(file_path)]._data is None
+
+def test_data_cache_streaming():
+    data_cache = DataCache(store=False)
+    streaming_cache = DataCache(store=False, chunksize=7)
+
+    # Assert that counts accumulated chunk by chunk match the counts of the whole file
+    frequency_tables = data_cache.load_frequency_tables(CLASSIFICATION_DATA_PATH, 'utf8')
+    for field_name, freq_table in streaming_cache.load_frequency_tables(CLASSIFICATION_DATA_PATH, 'utf8').items():
+        assert freq_table.equals(frequency_tables[field_name])
+
+    contingency_tables = data_cache.load_contingency_tables(CLASSIFICATION_DATA_PATH, 'utf8')
+    streamed_tables = streaming_cache.load_contingency_tables(CLASSIFICATION_DATA_PATH, 'utf8')
+    assert (streamed_tables.matrix != contingency_tables.matrix).nnz == 0
+    for field_name, categories in contingency_tables.categories.items():
+        assert (streamed_tables.categories[field_name] == categories).all()
+
+def test_data_cache_delta(tmp_path, project_classification_data):
+    file_path, delta_path = str(tmp_path / 'relis_classification.csv'), str(tmp_path / 'delta.csv')
+    changed = project_classification_data.iloc[[0]].assign(Scope='Inplace', **{'Targeted year': 1999})
+    pd.concat([project_classification_data.iloc[:-3], changed]).to_csv(file_path, index=False)
+    pd.concat([project_classification_data.iloc[-3:].assign(Operation='added'),
+               changed.assign(Operation='removed')]).to_csv(delta_path, index=False)
+
+    data_cache = DataCache(store=False)
+    data_cache.load_frequency_tables(file_path, 'utf8')
+    data_cache.apply_delta(file_path, 'utf8', delta_path)
+    expected_cache = DataCache(store=False)
+
+    # Assert that the updated statistics match the statistics of the whole classification data
+    expected = expected_cache.load_frequency_tables(CLASSIFICATION_DATA_PATH, 'utf8')
+    for field_name, table in data_cache.load_frequency_tables(file_path, 'utf8').items():
+        assert table.equals(expected[field_name])
+    expected = expected_cache.load_evolution_tables(CLASSIFICATION_DATA_PATH, 'utf8')
+    for field_name in expected.categories:
+        for array, expected_array in zip(data_cache.load_evolution_tables(file_path, 'utf8').table(field_name),
+                                         expected.table(field_name)):
+            assert (array == expected_array).all()
+    assert (data_cache.load_contingency_tables(file_path, 'utf8').matrix !=
+            expected_cache.load_contingency_tables(CLASSIFICATION_DATA_PATH, 'utf8').matrix).nnz == 0
+    assert data_cache.load_descriptive_statistics(file_path, 'utf8').equals(
+        expected_cache.load_descriptive_statistics(CLASSIFICATION_DATA_PATH, 'utf8'))
+
+    # Assert that the rows of the export can't be mistaken for the updated papers
+    with pytest.raises(ValueError):
+        data_cache.load_csv(file_path, 'utf8')
+    with pytest.raises(ValueError):
+        data_cache.load_multivalue_indexes(file_path, 'utf8')
+    with pytest.raises(ValueError):
+        data_cache.load_dataframe(file_path, 'utf8', NominalVariables, NominalDataFrame)
+
+    # Assert that removing papers twice is rejected
+    with pytest.raises(ValueError):
+        data_cache.apply_delta(file_path, 'utf8', delta_path)
+
+    # Assert that removing a paper which was counted with other values is rejected
+    data_cache = DataCache(store=False)
+    project_classification_data.iloc[[1]].assign(Domain='Artificial Intelligence', Operation='removed').to_csv(
+        delta_path, index=False)
+    with pytest.raises(ValueError):
+        data_cache.apply_delta(file_path, 'utf8', delta_path)
+
+def test_execution_plan():
+    plan = _build_execution_plan([('_comp_pearson_cor_test', (ContinuousVariables.publication_year,
+                                                               ContinuousVariables.targeted_year)),
+                                  ('comp_chi_squared_test', (NominalVariables.scope, NominalVariables.domain)),
+                                  ('comp_chi_squared_test', (NominalVariables.domain, NominalVariables.scope))],
+                                 CLASSIFICATION_DATA_PATH)
+    assert set(plan) == {'continuous_dataframe', 'shapiro_wilk_test:publication_year', 'shapiro_wilk_test:targeted_year',
+                         'multivalue_indexes', 'contingency_tables', 'chi_squared_tests', 'fisher_test:domain:scope'}
+    assert set(plan['fisher_test:domain:scope'].dependencies) == {'contingency_tables', 'chi_squared_tests'}
+
+    # Assert that every node runs once, after its dependencies
+    timings = _execute_plan(plan, workers=2)
+    order = list(timings['node'])
+    assert sorted(order) == sorted(plan)
+    for name, node in plan.items():
+        assert all(order.index(dependency) < order.index(name) for dependency in node.dependencies)
+    assert (timings['seconds'] >= 0).all()
+
+def test_figure_pool(monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(TEST_ROOT_DIRECTORY), 'python'))
+    plt.switch_backend('Agg')
+    plt.close('all')
+
+    # Assert that the plots are drawn on a single reused figure
+    figures = [_desc_bar_plot(variable) for variable in NominalVariables]
+    figures += [_comp_bubble_chart(NominalVariables.industrial, variable) for variable in NominalVariables
+                if variable is not NominalVariables.industrial]
+    for figure in figures:
+        _display_figure(figure)
+    assert len(plt.get_fignums()) <= 1
+    assert len({id(figure.figure if hasattr(figure, 'get_text') else figure) for figure in figures}) == 1
+
+def test_render_figures(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(TEST_ROOT_DIRECTORY), 'python'))
+    plots = [('_desc_bar_plot', (NominalVariables.domain,)),
+             ('_comp_bubble_chart', (NominalVariables.industrial, NominalVariables.scope)),
+             ('_desc_box_plot', (ContinuousVariables.publication_year,))]
+
+    # Assert that the worker processes write every figure in every format
+    paths = render_figures(str(tmp_path), plots, formats=('png', 'svg'), processes=2)
+    assert len(paths) == 6
+    for path in paths:
+        assert os.path.getsize(path) > 0
+    assert os.path.exists(tmp_path / 'comp_bubble_chart-industrial-scope.svg')
+
+    # Assert that the figures are rendered serially where fork is not the default start method
+    monkeypatch.setattr('multiprocessing.get_start_method', lambda: 'spawn')
+    monkeypatch.setattr('python.relis_statistics_kernel.ProcessPoolExecutor', None)
+    assert len(render_figures(str(tmp_path / 'spawn'), plots, processes=2)) == 3
+
+def test_run_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(TEST_ROOT_DIRECTORY), 'python'))
+    main(['run', '--statistics', 'desc_statistics', 'comp_chi_squared_test', 'evo_plot',
+          '--out', str(tmp_path), '--processes', '1'])
+
+    # Assert that every table and figure of the plan is written and listed in the report
+    nominal_size, continuous_size = len(NominalVariables), len(ContinuousVariables)
+    assert len(list(tmp_path.glob('comp_chi_squared_test-*.csv'))) == nominal_size * (nominal_size - 1)
+    assert len(list(tmp_path.glob('desc_statistics-*.csv'))) == continuous_size
+    assert len(list(tmp_path.glob('evo_plot-*.png'))) == nominal_size
+    report = (tmp_path / 'report.md').read_text(encoding='utf8')
+    assert 'Descriptive | Statistics : Publication year' in report
+    assert '(evo_plot-scope.png)' in report
+    assert 'evolution_tables' in (tmp_path / 'timings.csv').read_text(encoding='utf8')
+
+def test_lazy_imports():
+    code = '\n'.join([
+        'import sys, time, pandas',
+        'start = time.perf_counter()',
+        'import python.relis_statistics_kernel as kernel',
+        'seconds = time.perf_counter() - start',
+        'kernel.data_cache.store = False',
+        "kernel._desc_frequency_tables('data/relis_classification_CV.csv')",
+        "kernel._read_descriptive_statistics('data/relis_classification_CV.csv')",
+        "print(*[name for name in ('seaborn', 'matplotlib', 'scipy.stats', 'scipy.special') if name in sys.modules])",
+        'start = time.perf_counter()',
+        'import matplotlib.pyplot, seaborn, scipy.stats',
+        'print(seconds, time.perf_counter() - start)'
+    ])
+    modules, seconds = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(TEST_ROOT_DIRECTORY),
+                                      capture_output=True, text=True, check=True).stdout.split('\n')[:2]
+    kernel_seconds, deferred_seconds = map(float, seconds.split())
+
+    # Assert that the tables leave the plotting and testing libraries to the first plot or test
+    assert modules == ''
+
+    # Assert that importing the kernel, scipy.sparse included, is cheaper than the imports it defers
+    assert kernel_seconds < deferred_seconds
+
 def test_aggregate_nominal_variables(nominal_variables, aggregated_nominal_variables):
     assert _aggregate_variables_by_data_type(nominal_variables) == aggregated_nominal_variables
 
@@ -108,13 +325,20 @@ def test_processing_classification_continuous_data(project_classification_data,
     assert project_classification_continuous_data.equals(data)
     
 
+def test_transform_continuous_data(project_classification_data, aggregated_continuous_variables):
+    data = _transform_continuous_data(project_classification_data, aggregated_continuous_variables)
+
+    # Assert that continuous variables are numeric with NaN for missing values
+    assert (data.dtypes == 'float64').all()
+    assert data['targeted_year'].isnull().any()
+
 def create_test_substitute_nan(df: pd.DataFrame):
 
     # Apply the function
-    _substitute_nan(df)
+    data = _substitute_nan(df)
 
     # Assert that there are no NaN values in the DataFrame
-    assert not df.isnull().values.any(), "DataFrame still contains NaN values"
+    assert not data.isnull().values.any(), "DataFrame still contains NaN values"
 
 def test_substitute_nan_nominal_variables(project_classification_nominal_data):
     create_test_substitute_nan(project_classification_nominal_data)
@@ -122,6 +346,13 @@ def test_substitute_nan_nominal_variables(project_classification_nominal_data):
 def test_substitute_nan_continuous_variables(project_classification_continuous_data):
     create_test_substitute_nan(project_classification_continuous_data)
 
+def test_substitute_nan_copy(project_classification_data):
+    data = _substitute_nan(project_classification_data)
+
+    # Assert that the source DataFrame is left untouched
+    assert project_classification_data.isnull().values.any()
+    assert not data.isnull().values.any()
+
 def test_nominal_dataframe(nominal_dataframe, nominal_variables):
     assert nominal_dataframe.data.columns.size == len(nominal_variables)
     for variable in nominal_variables:
@@ -130,4 +361,272 @@ def test_nominal_dataframe(nominal_dataframe, nominal_variables):
 def test_continuous_dataframe(continuous_dataframe, continuous_variables):
     assert continuous_dataframe.data.columns.size == len(continuous_variables)
     for variable in continuous_variables:
-        assert variable.name in continuous_dataframe.data.columns
\ No newline at end of file
+        assert variable.name in continuous_dataframe.data.columns
+
+def test_memoized_dataframes():
+    nominal_dataframe = _nominal_dataframe(CLASSIFICATION_DATA_PATH)
+    continuous_dataframe = _continuous_dataframe(CLASSIFICATION_DATA_PATH)
+
+    # Assert that the typed frames are built once and shared
+    assert _nominal_dataframe(CLASSIFICATION_DATA_PATH) is nominal_dataframe
+    assert _continuous_dataframe(CLASSIFICATION_DATA_PATH) is continuous_dataframe
+
+    # Assert that continuous variables are parsed as numbers
+    assert (continuous_dataframe.data.dtypes == 'float64').all()
+
+    # Assert that nominal variables stay text
+    assert (nominal_dataframe.data.dtypes == object).all()
+
+    # Assert that the shared frames can't be mutated
+    with pytest.raises(ValueError):
+        nominal_dataframe.data['industrial'].iloc[0] = 'No'
+
+def test_freeze_dataframe():
+    data = pd.DataFrame({'Publication year': [2016., 2018.], 'Venue': ['A', 'B'], 'Targeted year': [2010., np.nan]})
+    frozen = _freeze_dataframe(data)
+
+    # Assert that the frozen frame stays read-only once pandas has consolidated it
+    assert frozen.equals(data[frozen.columns])
+    frozen.to_numpy()
+    for column in frozen.columns:
+        with pytest.raises(ValueError):
+            frozen.loc[0, column] = frozen.loc[1, column]
+
+def test_multivalue_index(project_classification_data, nominal_variables):
+    variable = nominal_variables.transformation_language.value
+    values = project_classification_data[variable.title]
+    index = _build_multivalue_index(values, variable.multiple)
+
+    assert len(index.offsets) == len(values) + 1
+    assert list(index.categories) == sorted(index.categories)
+    for row, value in enumerate(values):
+        items = index.categories[index.codes[index.offsets[row]:index.offsets[row + 1]]]
+        if pd.isna(value):
+            assert list(items) == ([] if Policies.DROP_NA.value else [''])
+        else:
+            assert list(items) == [item.strip() for item in value.split('|')]
+
+
+### Descriptive statistics
+
+def test_desc_frequency_tables(project_classification_data, nominal_variables):
+    freq_tables = _desc_frequency_tables(CLASSIFICATION_DATA_PATH)
+
+    assert list(freq_tables) == [variable.name for variable in nominal_variables]
+
+    freq_table = freq_tables['transformation_language']
+    assert dict(zip(freq_table['value'], freq_table['n']))['ATL'] == \
+        project_classification_data['Transformation Language'].str.contains('ATL').sum()
+    assert freq_table['n'].is_monotonic_decreasing
+    assert freq_table['percentage'].sum() == pytest.approx(100)
+
+def test_top_categories_folding(monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(TEST_ROOT_DIRECTORY), 'python'))
+
+    # Assert that the ties at the threshold are kept in the order of the categories
+    assert list(_top_categories(np.array([3, 1, 3, 2, 3, 0]), 2)) == [True, False, True, False, False, False]
+    assert _top_categories(np.array([3, 1]), None).all()
+
+    monkeypatch.setattr(NominalVariables.transformation_language.value, 'top', 2)
+    freq_table = _desc_frequency_table(NominalVariables.transformation_language)
+    comp_table = _comp_frequency_table(NominalVariables.transformation_language, NominalVariables.scope)
+
+    # Assert that the tail is folded into a single category, the same in both tables, blank values are kept apart
+    assert list(freq_table['value']) == ['Henshin', 'ATL', '', 'Other']
+    assert freq_table['n'].sum() == _desc_frequency_tables()['transformation_language']['n'].sum()
+    assert freq_table['percentage'].sum() == pytest.approx(100)
+    assert set(comp_table['transformation_language']) <= {'Henshin', 'ATL', '', 'Other'}
+    assert {'Henshin', 'ATL', 'Other'} <= set(comp_table['transformation_language'])
+    assert comp_table['Frequency'].sum() == _read_contingency_tables().table('transformation_language', 'scope').sum()
+
+    # Assert that an existing Other category is merged with the folded categories
+    freq_table = pd.DataFrame({'value': ['A', 'Other', 'B', 'C', 'D'], 'n': [5, 4, 3, 2, 1]})
+    freq_table['percentage'] = freq_table['n'] / freq_table['n'].sum() * 100
+    kept_categories = _kept_categories(freq_table, 2)
+    assert list(kept_categories) == ['A', 'B']
+    freq_table = _fold_frequency_table(freq_table, kept_categories)
+    assert list(freq_table['value']) == ['A', 'B', 'Other']
+    assert list(freq_table['n']) == [5, 3, 7]
+    codes, categories = _fold_categories(np.array(['Other', 'A', 'B'], dtype=object), np.array(['A']))
+    assert list(categories) == ['A', 'Other'] and list(codes) == [1, 0, 1]
+
+def test_top_categories_folding_consistency(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / 'python')
+    os.makedirs(tmp_path / 'data')
+    data = pd.read_csv(os.path.join(TEST_ROOT_DIRECTORY, 'data', 'relis_classification_CV.csv'), dtype=str)
+    # A repeated item counts once per occurrence in the frequency table but squared on the contingency diagonal
+    data.loc[data['Transformation Language'] == 'QVT', 'Transformation Language'] = 'QVT | QVT | QVT'
+    data.loc[0, 'Transformation Language'] = np.nan
+    data.to_csv(tmp_path / 'data' / 'relis_classification_CV.csv', index=False)
+    monkeypatch.chdir(tmp_path / 'python')
+    monkeypatch.setattr(NominalVariables.transformation_language.value, 'top', 1)
+
+    freq_table = _desc_frequency_table(NominalVariables.transformation_language)
+    _, categories, _ = _fold_contingency_table('transformation_language', 'scope')
+
+    # Assert that both paths keep the same categories and that blank values are neither kept nor folded
+    assert '' in set(freq_table['value']) and '' in set(categories)
+    assert set(freq_table['value']) == set(categories)
+    assert list(_kept_categories(_desc_frequency_tables()['transformation_language'], 1)) == ['Henshin']
+
+def test_descriptive_statistics(continuous_variables):
+    data = pd.DataFrame({'publication_year': [2016, 2018, 2016, 2019, 2017, 2011],
+                         'targeted_year': [2013, 2010, np.nan, 2011, 2015, 2012]})
+    statistics = _build_descriptive_statistics(data)
+
+    # Assert that every variable gets a row matching pandas' own statistics
+    assert list(statistics.index) == [variable.value.title for variable in continuous_variables]
+    for variable in continuous_variables:
+        series = data[variable.name]
+        result = statistics.loc[variable.value.title]
+        assert result['n'] == series.count()
+        assert result['mean'] == pytest.approx(series.mean())
+        assert result['sd'] == pytest.approx(series.std())
+        assert result['median'] == pytest.approx(series.median())
+        assert result['min'] == series.min()
+        assert result['max'] == series.max()
+        assert result['trimmed'] == pytest.approx(
+            series[series.between(series.quantile(0.25), series.quantile(0.75))].mean())
+
+def test_descriptive_statistics_without_papers(continuous_variables):
+    data = pd.DataFrame({variable.name: [] for variable in continuous_variables}, dtype='float64')
+    statistics = _build_descriptive_statistics(data)
+
+    # Assert that every variable gets a row without any defined statistic
+    assert list(statistics.index) == [variable.value.title for variable in continuous_variables]
+    assert (statistics['n'] == 0).all()
+    assert statistics.drop(columns=['vars', 'n']).isna().all().all()
+
+### Comparative statistics
+
+def test_evolution_tables(project_classification_data):
+    evolution_tables = _read_evolution_tables(CLASSIFICATION_DATA_PATH)
+    years, categories, frequencies = evolution_tables.table('scope')
+
+    # Assert that the counts match the exploded classification data
+    data = project_classification_data[['Publication year', 'Scope']].dropna()
+    data['Scope'] = data['Scope'].str.split('|')
+    data = data.explode('Scope')
+    expected = pd.crosstab(data['Publication year'], data['Scope'].str.strip())
+    assert list(years) == list(expected.index)
+    assert list(categories) == list(expected.columns)
+    assert (frequencies == expected.to_numpy()).all()
+
+def test_window_frequencies():
+    years = np.array([2010, 2011, 2013, 2014, 2018])
+    frequencies = np.array([[1, 0], [2, 1], [0, 3], [4, 0], [1, 1]])
+
+    # Assert that prefix sums match per year window sums, gaps included
+    assert (_window_frequencies(years, frequencies, None) == frequencies.cumsum(axis=0)).all()
+    for window in (1, 3, 5):
+        expected = [frequencies[(years > year - window) & (years <= year)].sum(axis=0) for year in years]
+        assert (_window_frequencies(years, frequencies, window) == np.array(expected)).all()
+
+    with pytest.raises(ValueError):
+        _window_frequencies(years, frequencies, 0)
+
+def test_contingency_tables(project_classification_data):
+    contingency_tables = _read_contingency_tables(CLASSIFICATION_DATA_PATH)
+    table = contingency_tables.table('transformation_language', 'scope')
+
+    # Assert that symmetric comparisons share the same counts
+    assert (table.toarray() == contingency_tables.table('scope', 'transformation_language').toarray().T).all()
+
+    # Assert that the counts match the exploded classification data
+    data = project_classification_data[['Transformation Language', 'Scope']].dropna()
+    for column in data:
+        data[column] = data[column].str.split('|')
+        data = data.explode(column)
+        data[column] = data[column].str.strip()
+    expected = data.groupby(['Transformation Language', 'Scope']).size()
+
+    categories = contingency_tables.categories['transformation_language']
+    comparison_categories = contingency_tables.categories['scope']
+    assert table.sum() == expected.sum()
+    for row, col, frequency in zip(table.row, table.col, table.data):
+        assert expected[(categories[row], comparison_categories[col])] == frequency
+
+def test_chi_squared_tests():
+    contingency_tables = _read_contingency_tables(CLASSIFICATION_DATA_PATH)
+    tests = _read_chi_squared_tests(CLASSIFICATION_DATA_PATH)
+
+    # Assert that every pair matches scipy's test on its own contingency table
+    for (field_name, comparison_field_name), result in tests.iterrows():
+        table = _trim_contingency_table(contingency_tables.table(field_name, comparison_field_name))
+        if table.size == 0:
+            assert pd.isna(result['p-value'])
+            continue
+        statistic, p_value, dof, _ = chi2_contingency(table)
+        assert result['statistic'] == pytest.approx(statistic, abs=1e-9)
+        assert result['p-value'] == pytest.approx(p_value, abs=1e-9)
+        assert result['dof'] == dof
+
+def test_trim_contingency_table():
+    dense = np.zeros((50, 40), dtype=np.int64)
+    dense[[3, 3, 17, 42], [5, 31, 5, 8]] = [2, 1, 4, 1]
+
+    # Assert that the sparse table is trimmed to the same block as the dense one
+    expected = dense[dense.sum(axis=1) > 0][:, dense.sum(axis=0) > 0]
+    table = _trim_contingency_table(sparse.coo_matrix(dense))
+    assert table.shape == (3, 3)
+    assert (table == expected).all()
+
+def test_fisher_test():
+    table = np.array([[8, 2], [1, 5]])
+    assert _small_expected_frequencies(table)
+    assert not _small_expected_frequencies(table * 10)
+
+    # Assert that 2x2 tables get the exact test and that the simulation converges to it
+    assert _fisher_test(table)[1] == pytest.approx(fisher_exact(table)[1])
+    assert _monte_carlo_fisher_test(table, 20000, 0) == pytest.approx(fisher_exact(table)[1], abs=0.01)
+
+    # Assert that the simulation is reproducible, whatever the number of workers
+    table = np.array([[3, 0, 1], [0, 4, 1], [2, 1, 0]])
+    statistic_name, p_value = _fisher_test(table, 5000, 1)
+    assert statistic_name == "Fisher's test (Monte Carlo)"
+    assert 0 < p_value < 1
+    assert p_value == _fisher_test(table, 5000, 1, workers=3)[1]
+
+def test_fisher_test_cache(monkeypatch):
+    data_cache = DataCache(store=False)
+    fisher_result = data_cache.load_fisher_test(CLASSIFICATION_DATA_PATH, 'utf8', 'transformation_language', 'scope')
+    misses = data_cache.stats()['misses']
+
+    # Assert that both orders of a pair share the same cached result
+    assert fisher_result[0] == "Fisher's test (Monte Carlo)"
+    assert data_cache.load_fisher_test(CLASSIFICATION_DATA_PATH, 'utf8', 'scope', 'transformation_language') is fisher_result
+    assert data_cache.stats()['misses'] == misses
+
+    # Assert that the matrix reports Fisher's test for the same pairs as comp_chi_squared_test
+    monkeypatch.chdir(os.path.join(os.path.dirname(TEST_ROOT_DIRECTORY), 'python'))
+    subset_data = _comp_chi_squared_matrix([NominalVariables.transformation_language, NominalVariables.scope])
+    assert list(subset_data['test']) == ["Fisher's test (Monte Carlo)"]
+    assert subset_data['p-value'][0] == \
+        _comp_chi_squared_test(NominalVariables.scope, NominalVariables.transformation_language)['p-value'][0]
+
+def test_shapiro_wilk_test_cache(continuous_variables):
+    for variable in continuous_variables:
+        shapiro_result = _read_shapiro_wilk_test(variable.name, CLASSIFICATION_DATA_PATH)
+
+        # Assert that the normality test is computed once per variable
+        assert _read_shapiro_wilk_test(variable.name, CLASSIFICATION_DATA_PATH) is shapiro_result
+
+        series = _continuous_dataframe(CLASSIFICATION_DATA_PATH).data[variable.name]
+        assert tuple(shapiro_result) == tuple(shapiro(series.fillna(0)))
+
+def test_correlation_matrix():
+    values = np.random.default_rng(0).normal(size=(50, 3))
+    values[:, 1] += values[:, 0]
+
+    pearson_coefficients, pearson_p_values = _correlation_matrix(values)
+    spearman_coefficients, spearman_p_values = _correlation_matrix(rankdata(values, axis=0))
+
+    # Assert that every pair matches scipy's pairwise tests
+    for i in range(3):
+        for j in range(i + 1, 3):
+            pearson_result = pearsonr(values[:, i], values[:, j])
+            spearman_result = spearmanr(values[:, i], values[:, j])
+            assert pearson_coefficients[i, j] == pytest.approx(pearson_result.statistic)
+            assert pearson_p_values[i, j] == pytest.approx(pearson_result.pvalue)
+            assert spearman_coefficients[i, j] == pytest.approx(spearman_result.statistic)
+            assert spearman_p_values[i, j] == pytest.approx(spearman_result.pvalue)
@@ -1,25 +1,50 @@
-import re
+import os
+import time
+import shutil
+import argparse
+import threading
+import hashlib
+import tempfile
+import importlib
+import multiprocessing
 import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 from enum import Enum
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from graphlib import TopologicalSorter
 from typing import Type
-from matplotlib import ticker
-from matplotlib.text import Text
-from statsmodels.robust.scale import mad
-from scipy.stats import kurtosis, skew, shapiro, spearmanr, pearsonr, chi2_contingency
+from scipy import sparse
 
 #-- Environment version : {{attribute(export_config,'ENVIRONMENT_VERSION')}}
 #-- Generated timestamp: {{attribute(export_config,'DATE_TIME_GENERATED')}}
 
 ### Config
 
-plt.rcParams['figure.max_open_warning'] = 0
+class LazyModule:
+    def __init__(self, name: str, configure = None):
+        # The module is only imported on its first use
+        self._name = name
+        self._configure = configure
+        self._module = None
+
+    def __getattr__(self, attribute: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+            if self._configure: self._configure()
+        return getattr(self._module, attribute)
 
 custom = {'axes.edgecolor': 'black', 'grid.linestyle': 'dashed', 'grid.color': 'grey'}
 
-sns.set_style('darkgrid', rc = custom)
+# Tables only need pandas, the plotting and testing libraries are imported by the first plot or test
+plt = LazyModule('matplotlib.pyplot', lambda: sns.set_style('darkgrid', rc = custom))
+sns = LazyModule('seaborn')
+ticker = LazyModule('matplotlib.ticker')
+rcsetup = LazyModule('matplotlib.rcsetup')
+text = LazyModule('matplotlib.text')
+stats = LazyModule('scipy.stats')
+special = LazyModule('scipy.special')
 
 class Multivalue(Enum):
     SEPARATOR = '{{attribute(export_config,'MULTIVALUE_SEPARATOR')}}'
@@ -27,6 +52,22 @@ class Multivalue(Enum):
 class Policies(Enum):
     DROP_NA = {{attribute(export_config,'DROP_NA') ? 'True' : 'False' }}
 
+class Delta(Enum):
+    OPERATION = 'Operation'
+    ADDED = 'added'
+    REMOVED = 'removed'
+
+class Folding(Enum):
+    OTHER = 'Other'
+
+class FisherTest(Enum):
+    MIN_EXPECTED = 5
+    RESAMPLES = 10000
+    SEED = 2024
+    WORKERS = 1
+    # Shuffled observations or table cells, whichever is larger, held in memory by a batch of resamples
+    BATCH_BUDGET = 1000000
+
 ### Types
 
 class VariableDataType(Enum):
@@ -34,11 +75,13 @@ class VariableDataType(Enum):
     CONTINUOUS = 'Continuous'
 
 class Variable:
-    def __init__(self, name: str, title: str, data_type: VariableDataType, multiple: bool):
+    def __init__(self, name: str, title: str, data_type: VariableDataType, multiple: bool, top: int | None = None):
         self.name = name
         self.title = title
         self.data_type = data_type
         self.multiple = multiple
+        # Categories shown by the tables and plots, the others are folded into a single one
+        self.top = top
 
 {#Producing the Nominal variables of our configuration model #}
 class NominalVariables(Enum):
@@ -69,34 +112,619 @@ class ContinuousDataFrame(DataFrame):
     def __init__(self, data: pd.DataFrame, variable_type: Type[ContinuousVariables]):
         super().__init__(data, variable_type)
 
-class DataCache:
+class MultivalueIndex:
+    def __init__(self, offsets: np.ndarray, codes: np.ndarray, categories: np.ndarray, blank: np.ndarray):
+        # Row i owns the category codes in codes[offsets[i]:offsets[i + 1]]
+        self.offsets = offsets
+        self.codes = codes
+        self.categories = categories
+        self.blank = blank
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.offsets) - 1), self.lengths())
+
+    def indicator(self) -> sparse.csr_matrix:
+        # One-hot item counts per row, empty rows are left out of comparisons
+        lengths = np.where(self.blank, 0, self.lengths())
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        codes = self.codes[~self.blank[self.rows()]]
+        return sparse.csr_matrix((np.ones(len(codes), dtype=np.int64), codes, offsets),
+                                 shape=(len(lengths), len(self.categories)))
+
+class ContingencyTables:
+    def __init__(self, matrix: sparse.csr_matrix, categories: dict[str, np.ndarray]):
+        # Co-occurrence counts of every pair of categories, one block per pair of variables
+        self.matrix = matrix
+        self.categories = categories
+        self.bounds = _category_bounds(categories)
+
+    def table(self, field_name: str, comparison_field_name: str) -> sparse.coo_matrix:
+        start, end = self.bounds[field_name]
+        comparison_start, comparison_end = self.bounds[comparison_field_name]
+        return self.matrix[start:end, comparison_start:comparison_end].tocoo()
+
+class EvolutionTables:
+    def __init__(self, years: np.ndarray, matrix: np.ndarray, categories: dict[str, np.ndarray]):
+        # Papers of every category per publication year, one block of columns per variable
+        self.years = years
+        self.matrix = matrix
+        self.categories = categories
+        self.bounds = _category_bounds(categories)
+
+    def table(self, field_name: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start, end = self.bounds[field_name]
+        categories = self.categories[field_name]
+
+        # Empty values are left out, as well as the years and categories without papers
+        frequencies = self.matrix[:, start:end][:, categories != '']
+        categories = categories[categories != '']
+        rows, columns = frequencies.any(axis=1), frequencies.any(axis=0)
+
+        return self.years[rows], categories[columns], frequencies[rows][:, columns]
+
+class ClassificationCounts:
     def __init__(self):
-        self.cache = {}
+        # Mergeable counts of the papers, a weight of -1 removes papers counted before.
+        # Categories and years get a global code in order of appearance, chunk after chunk.
+        self.labels = {variable.name: {} for variable in NominalVariables}
+        self.size = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self.years = {}
+        self.year_matrix = sparse.csr_matrix((0, 0), dtype=np.int64)
+        # Distinct rows of continuous values with their number of papers
+        self.values = np.zeros((0, len(ContinuousVariables)), dtype=np.float64)
+        self.weights = np.zeros(0, dtype=np.int64)
+
+    def _codes(self, field_name: str, categories: np.ndarray) -> np.ndarray:
+        labels = self.labels[field_name]
+        for category in categories:
+            if category not in labels:
+                labels[category] = self.size
+                self.size += 1
+        return np.array([labels[category] for category in categories], dtype=np.int64)
+
+    def _year_codes(self, years: np.ndarray) -> np.ndarray:
+        year_values, year_codes = np.unique(years, return_inverse=True)
+        for year in year_values.tolist():
+            self.years.setdefault(year, len(self.years))
+        return np.array([self.years[year] for year in year_values.tolist()], dtype=np.int64)[year_codes]
+
+    def update(self, chunk: pd.DataFrame, weight = 1):
+        indexes = {variable.name: _build_multivalue_index(chunk[variable.value.title], variable.value.multiple)
+                   for variable in NominalVariables}
+        variable_codes = {field_name: self._codes(field_name, index.categories) for field_name, index in indexes.items()}
+        codes = np.concatenate(list(variable_codes.values()))
+
+        counts = np.zeros(self.size, dtype=np.int64)
+        counts[:len(self.counts)] = self.counts
+        counts[codes] += weight * np.concatenate([np.bincount(index.codes, minlength=len(index.categories))
+                                                  for index in indexes.values()])
+        self.counts = counts
+
+        # Project the co-occurrences of the chunk onto the global codes
+        projection = sparse.csr_matrix((np.ones(len(codes), dtype=np.int64), codes, np.arange(len(codes) + 1)),
+                                       shape=(len(codes), self.size))
+        matrix = projection.T @ _build_contingency_tables(indexes).matrix @ projection
+        self.matrix.resize((self.size, self.size))
+        self.matrix = (self.matrix + weight * matrix).tocsr()
+
+        # Papers of every category per publication year
+        publication_year = chunk[ContinuousVariables.publication_year.value.title].to_numpy(dtype=np.float64)
+        year_codes, category_codes = [], []
+        for field_name, index in indexes.items():
+            years = publication_year[index.rows()]
+            kept = ~np.isnan(years)
+            year_codes.append(self._year_codes(years[kept].astype(np.int64)))
+            category_codes.append(variable_codes[field_name][index.codes[kept]])
+        year_codes, category_codes = np.concatenate(year_codes), np.concatenate(category_codes)
+        year_matrix = sparse.csr_matrix((np.full(len(year_codes), weight, dtype=np.int64), (year_codes, category_codes)),
+                                        shape=(len(self.years), self.size))
+        self.year_matrix.resize((len(self.years), self.size))
+        self.year_matrix = (self.year_matrix + year_matrix).tocsr()
+
+        titles = [variable.value.title for variable in ContinuousVariables]
+        values = pd.concat([pd.DataFrame(self.values, columns=titles).assign(weight=self.weights),
+                            chunk[titles].astype('float64').assign(weight=weight)])
+        weights = values.groupby(titles, dropna=False)['weight'].sum()
+        weights = weights[weights != 0]
+        self.values = weights.index.to_frame().to_numpy(dtype=np.float64)
+        self.weights = weights.to_numpy(dtype=np.int64)
+
+    def categories(self) -> dict[str, np.ndarray]:
+        # Same sorted code dictionaries as the multivalue indexes, removed categories are left out
+        return {field_name: np.array(sorted(category for category, code in labels.items() if self.counts[code]),
+                                     dtype=object)
+                for field_name, labels in self.labels.items()}
+
+    def _order(self) -> np.ndarray:
+        return np.array([self.labels[field_name][category]
+                         for field_name, categories in self.categories().items() for category in categories],
+                        dtype=np.int64)
+
+    def frequency_tables(self) -> dict[str, pd.DataFrame]:
+        return _build_frequency_tables(self.categories(), self.counts[self._order()])
+
+    def contingency_tables(self) -> ContingencyTables:
+        order = self._order()
+        matrix = self.matrix[order][:, order].tocsr()
+        matrix.eliminate_zeros()
+        matrix.sort_indices()
+        return ContingencyTables(matrix, self.categories())
+
+    def evolution_tables(self) -> EvolutionTables:
+        years = np.array(sorted(self.years), dtype=np.int64)
+        matrix = self.year_matrix[[self.years[year] for year in years.tolist()]][:, self._order()].toarray()
+        return EvolutionTables(years, matrix, self.categories())
+
+    def continuous_data(self) -> pd.DataFrame:
+        # One row per paper, in the order of the distinct values
+        data = pd.DataFrame(np.repeat(self.values, self.weights, axis=0),
+                            columns=[variable.name for variable in ContinuousVariables])
+        return _freeze_dataframe(data)
+
+class CacheEntry:
+    def __init__(self, file_path: str, encoding: str, signature: tuple[int, int], digest: str):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.signature = signature
+        self.digest = digest
+        self.results = {}
+        self.nbytes = 0
+        self._data = None
+        self._lock = threading.Lock()
+
+    @property
+    def data(self) -> pd.DataFrame:
+        # The classification file is only parsed when a result is missing from the columnar store
+        with self._lock:
+            if self._data is None:
+                self._data = _freeze_dataframe(pd.read_csv(self.file_path, encoding=self.encoding,
+                                                           dtype=_classification_dtypes(),
+                                                           usecols=list(_classification_dtypes())))
+                self.nbytes += _nbytes(self._data)
+        return self._data
+
+class DataCache:
+    def __init__(self, memory_budget: int | None = 1024 ** 3, store = True, chunksize: int | None = None):
+        # Classification files ordered from the least to the most recently used
+        self.entries = OrderedDict()
+        self.memory_budget = memory_budget
+        self.store = store
+        # Frequency and contingency counts of very large exports are streamed in chunks of papers
+        self.chunksize = chunksize
+        # Delta files applied to every classification file since its export
+        self.deltas = {}
+        self.hits = 0
+        self.misses = 0
+        # Results are built outside of the lock, the planner builds independent results in parallel
+        self.lock = threading.RLock()
+
+    def _load_entry(self, file_path: str, encoding: str, count = False) -> CacheEntry:
+        file_path = os.path.abspath(file_path)
+        signature = _file_signature(file_path)
+
+        with self.lock:
+            entry = self.entries.get(file_path)
+
+            # A touched file keeps its cached data, a re-exported one is parsed again
+            if entry is not None and entry.signature != signature:
+                if _file_digest(file_path) == entry.digest:
+                    entry.signature = signature
+                else:
+                    # A new export already contains the papers of the deltas
+                    self.invalidate(file_path)
+                    self.deltas.pop(file_path, None)
+                    entry = None
+
+            if count:
+                if entry is None: self.misses += 1
+                else: self.hits += 1
+
+            if entry is None:
+                entry = CacheEntry(file_path, encoding, signature, _file_digest(file_path))
+                self.entries[file_path] = entry
+
+            self.entries.move_to_end(file_path)
+            self._evict()
+            return entry
+
+    def _load_result(self, file_path: str, encoding: str, key: tuple, build):
+        entry = self._load_entry(file_path, encoding)
+
+        with self.lock:
+            if key in entry.results:
+                self.hits += 1
+                return entry.results[key]
+            self.misses += 1
+
+        result = build(entry)
+
+        with self.lock:
+            entry.results[key] = result
+            entry.nbytes += _nbytes(result)
+            self._evict()
+
+        return result
+
+    def _load_stored_result(self, file_path: str, encoding: str, key: tuple, name: str, build, dump, restore):
+        def load(entry: CacheEntry):
+            if not self.store: return build(entry)
+
+            directory = _store_directory(entry.file_path, entry.digest)
+            arrays = _load_arrays(directory, name)
+            if arrays is not None: return restore(arrays)
+
+            result = build(entry)
+            _save_arrays(directory, name, dump(result))
+            return result
+
+        return self._load_result(file_path, encoding, key, load)
+
+    def _evict(self):
+        if self.memory_budget is None: return
+
+        # The most recently used file is always kept
+        with self.lock:
+            while len(self.entries) > 1 and self.nbytes() > self.memory_budget:
+                self.entries.popitem(last=False)
+
+    def _summarized(self, file_path: str) -> bool:
+        # Streamed exports and exports updated by deltas are served from their counts
+        return bool(self.chunksize) or os.path.abspath(file_path) in self.deltas
+
+    def _check_rows(self, file_path: str):
+        # Deltas only update the counts, the rows of the export don't include their papers
+        if os.path.abspath(file_path) in self.deltas:
+            raise ValueError(f'The rows of {file_path} do not include its deltas, only the counts derived from them do')
+
+    def nbytes(self) -> int:
+        return sum(entry.nbytes for entry in self.entries.values())
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries), 'bytes': self.nbytes()}
+
+    def invalidate(self, file_path: str | None = None):
+        with self.lock:
+            if file_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.abspath(file_path), None)
 
     def load_csv(self, file_path: str, encoding: str):
-        if file_path not in self.cache:
-            self.cache[file_path] = pd.read_csv(file_path, encoding=encoding)
-        return self.cache[file_path]
+        self._check_rows(file_path)
+        return self._load_entry(file_path, encoding, count=True).data
+
+    def load_dataframe(self, file_path: str, encoding: str,
+                       variable_type: Type[NominalVariables] | Type[ContinuousVariables],
+                       dataframe_type: Type[NominalDataFrame] | Type[ContinuousDataFrame]):
+        key = ('dataframe', Policies.DROP_NA.value, variable_type)
+
+        build = lambda entry: _build_dataframe(entry.data, variable_type, dataframe_type)
+
+        # The statistics count the nominal variables from the multivalue indexes, their frame is never stored
+        if dataframe_type is NominalDataFrame:
+            self._check_rows(file_path)
+            return self._load_result(file_path, encoding, key, build)
+
+        if self._summarized(file_path):
+            return self._load_result(file_path, encoding, key, lambda entry: dataframe_type(
+                self.load_classification_counts(file_path, encoding).continuous_data(), variable_type))
+
+        return self._load_stored_result(file_path, encoding, key, variable_type.__name__, build, _dump_dataframe,
+                                        lambda arrays: _restore_dataframe(arrays, variable_type))
+
+    def load_multivalue_indexes(self, file_path: str, encoding: str):
+        self._check_rows(file_path)
+        key = ('multivalue_indexes', Policies.DROP_NA.value)
+        return self._load_stored_result(file_path, encoding, key, 'MultivalueIndexes', lambda entry: {
+            variable.name: _build_multivalue_index(entry.data[variable.value.title], variable.value.multiple)
+            for variable in NominalVariables
+        }, _dump_multivalue_indexes, _restore_multivalue_indexes)
+
+    def load_classification_counts(self, file_path: str, encoding: str):
+        key = ('classification_counts', Policies.DROP_NA.value)
+
+        def build(entry: CacheEntry):
+            chunks = _read_classification_chunks(entry.file_path, entry.encoding, self.chunksize) \
+                if self.chunksize else [entry.data]
+            counts = ClassificationCounts()
+            for chunk in chunks:
+                counts.update(chunk)
+            for delta_path in self.deltas.get(entry.file_path, []):
+                _apply_classification_delta(counts, delta_path, entry.encoding, self.chunksize)
+            return counts
+
+        return self._load_result(file_path, encoding, key, build)
+
+    def apply_delta(self, file_path: str, encoding: str, delta_path: str):
+        # The cached counts are updated in place and their entry reset as a single step
+        with self.lock:
+            counts = self.load_classification_counts(file_path, encoding)
+            try:
+                _apply_classification_delta(counts, delta_path, encoding, self.chunksize)
+            except ValueError:
+                self.invalidate(file_path)
+                raise
+
+            entry = self._load_entry(file_path, encoding)
+            self.deltas.setdefault(entry.file_path, []).append(os.path.abspath(delta_path))
+
+            # The other results are rebuilt from the updated counts when they are used again
+            entry.results = {('classification_counts', Policies.DROP_NA.value): counts}
+            entry.nbytes = _nbytes(counts) + _nbytes(entry._data)
+            self._evict()
+
+    def load_frequency_tables(self, file_path: str, encoding: str):
+        key = ('frequency_tables', Policies.DROP_NA.value)
+
+        def build(entry: CacheEntry):
+            if self._summarized(file_path):
+                return self.load_classification_counts(file_path, encoding).frequency_tables()
+
+            indexes = self.load_multivalue_indexes(file_path, encoding)
+            return _build_frequency_tables({field_name: index.categories for field_name, index in indexes.items()},
+                                           _count_multivalue_indexes(indexes))
+
+        return self._load_result(file_path, encoding, key, build)
+
+    def load_contingency_tables(self, file_path: str, encoding: str):
+        key = ('contingency_tables', Policies.DROP_NA.value)
+
+        def build(entry: CacheEntry):
+            if self._summarized(file_path):
+                return self.load_classification_counts(file_path, encoding).contingency_tables()
+
+            return _build_contingency_tables(self.load_multivalue_indexes(file_path, encoding))
+
+        return self._load_result(file_path, encoding, key, build)
+
+    def load_evolution_tables(self, file_path: str, encoding: str):
+        key = ('evolution_tables', Policies.DROP_NA.value)
+
+        def build(entry: CacheEntry):
+            if self._summarized(file_path):
+                return self.load_classification_counts(file_path, encoding).evolution_tables()
+
+            continuous_data = self.load_dataframe(file_path, encoding, ContinuousVariables, ContinuousDataFrame).data
+            return _build_evolution_tables(continuous_data['publication_year'],
+                                           self.load_multivalue_indexes(file_path, encoding))
+
+        return self._load_result(file_path, encoding, key, build)
+
+    def load_chi_squared_tests(self, file_path: str, encoding: str):
+        key = ('chi_squared_tests', Policies.DROP_NA.value)
+        return self._load_result(file_path, encoding, key, lambda entry:
+                                 _build_chi_squared_tests(self.load_contingency_tables(file_path, encoding)))
+
+    def load_fisher_test(self, file_path: str, encoding: str, field_name: str, comparison_field_name: str):
+        # Both orders of a pair are tested on the same table so that they share the same result
+        field_names = tuple(sorted([field_name, comparison_field_name]))
+        key = ('fisher_test', Policies.DROP_NA.value, field_names)
+        return self._load_result(file_path, encoding, key, lambda entry: _build_fisher_test(
+            self.load_contingency_tables(file_path, encoding), self.load_chi_squared_tests(file_path, encoding),
+            *field_names))
+
+    def load_descriptive_statistics(self, file_path: str, encoding: str):
+        key = ('descriptive_statistics', Policies.DROP_NA.value)
+        return self._load_result(file_path, encoding, key, lambda entry: _build_descriptive_statistics(
+            self.load_dataframe(file_path, encoding, ContinuousVariables, ContinuousDataFrame).data))
+
+    def load_shapiro_wilk_test(self, file_path: str, encoding: str, field_name: str):
+        key = ('shapiro_wilk_test', Policies.DROP_NA.value, field_name)
+        return self._load_result(file_path, encoding, key, lambda entry: _build_shapiro_wilk_test(
+            self.load_dataframe(file_path, encoding, ContinuousVariables, ContinuousDataFrame).data[field_name]))
+
+class FigurePool:
+    def __init__(self, label = 'ReLiS statistics', figsize = (10, 6)):
+        # Plots are drawn on the same figure, cleared before every plot, until the figure is displayed
+        self.label = label
+        self.figsize = figsize
+
+    def create(self):
+        figure = plt.figure(num=self.label, figsize=self.figsize)
+
+        # Clearing the axes of the previous plot is cheaper than building new axes
+        if len(figure.axes) == 1:
+            axes = figure.axes[0]
+            axes.clear()
+            plt.sca(axes)
+        else:
+            figure.clear()
+            axes = figure.subplots()
+
+        return figure, axes
+
+    def title(self, title: str):
+        self.create()
+        return plt.title(title)
+
+    def interactive(self) -> bool:
+        return plt.get_backend().lower() not in rcsetup.non_interactive_bk
+
+    def release(self, figure):
+        # A displayed figure keeps its window, the next plot is drawn on a new figure
+        figure.set_label('')
+
+    def close(self):
+        plt.close(self.label)
+
+class PlanNode:
+    def __init__(self, name: str, dependencies: list[str], build):
+        # An intermediate result shared by statistics, built once by the data cache
+        self.name = name
+        self.dependencies = dependencies
+        self.build = build
+        self.seconds = np.nan
 
 ### Shared
 
-def _substitute_nan(df: pd.DataFrame) -> None:
-    df.replace(np.nan, '', inplace=True)
+figure_pool = FigurePool()
+
+def _substitute_nan(df: pd.DataFrame) -> pd.DataFrame:
+    return df.replace(np.nan, '')
+
+def _classification_dtypes() -> dict[str, str]:
+    # Nominal variables are parsed as text and continuous variables as numbers, missing values stay NaN
+    dtypes = {variable.value.title: 'str' for variable in NominalVariables}
+    dtypes.update({variable.value.title: 'float64' for variable in ContinuousVariables})
+    return dtypes
+
+def _file_signature(file_path: str) -> tuple[int, int]:
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _file_digest(file_path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 ** 2), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _store_directory(file_path: str, digest: str) -> str:
+    # One columnar store per content and configuration of the kernel, next to the classification file
+    schema = [(variable.name, variable.value.title, variable.value.multiple)
+              for variables in (NominalVariables, ContinuousVariables) for variable in variables]
+    configuration = repr((digest, Multivalue.SEPARATOR.value, Policies.DROP_NA.value, schema))
+    key = hashlib.blake2b(configuration.encode(), digest_size=8).hexdigest()
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(os.path.dirname(file_path), '.relis_cache', f'{stem}-{key}')
+
+def _load_arrays(directory: str, name: str) -> dict[str, np.ndarray] | None:
+    path = os.path.join(directory, name)
+    if not os.path.isdir(path): return
+
+    # Memory mapped arrays are paged in lazily by the operating system
+    return {os.path.splitext(file_name)[0]: np.load(os.path.join(path, file_name), mmap_mode='r', allow_pickle=False)
+            for file_name in os.listdir(path)}
+
+def _save_arrays(directory: str, name: str, arrays: dict[str, np.ndarray]):
+    parent, current = os.path.split(directory)
+    staging = None
+    try:
+        if not os.path.isdir(directory):
+            # Stores of previous exports of the same file are outdated
+            if os.path.isdir(parent):
+                for other in os.listdir(parent):
+                    if other != current and other.rsplit('-', 1)[0] == current.rsplit('-', 1)[0]:
+                        shutil.rmtree(os.path.join(parent, other), ignore_errors=True)
+            os.makedirs(directory, exist_ok=True)
+
+        staging = tempfile.mkdtemp(dir=directory)
+        for array_name, array in arrays.items():
+            np.save(os.path.join(staging, f'{array_name}.npy'), array, allow_pickle=False)
+        os.replace(staging, os.path.join(directory, name))
+    except OSError:
+        # The store only speeds up warm starts, a read-only location is not an error
+        if staging: shutil.rmtree(staging, ignore_errors=True)
+
+def _nbytes(value) -> int:
+    # Approximate memory footprint of the cached results
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, (MultivalueIndex, ContingencyTables, EvolutionTables, ClassificationCounts, DataFrame)) \
+            or sparse.issparse(value):
+        return _nbytes(vars(value))
+    return 0
+
+def _category_bounds(categories: dict[str, np.ndarray]) -> dict[str, tuple[int, int]]:
+    # Every variable owns a contiguous block of the stacked category codes
+    sizes = [len(variable_categories) for variable_categories in categories.values()]
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+    return {field_name: (start, end) for field_name, start, end in zip(categories, starts, starts[1:])}
+
+def _stacked_codes(indexes: dict[str, MultivalueIndex]) -> tuple[np.ndarray, int]:
+    # Offset the codes of every variable so that a single bincount covers all of them
+    bounds = _category_bounds({field_name: index.categories for field_name, index in indexes.items()})
+    codes = np.concatenate([index.codes + bounds[field_name][0] for field_name, index in indexes.items()])
+    return codes, max(end for _, end in bounds.values())
+
+def _freeze_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    # Cached frames are shared by every statistic, writing into them must fail loudly.
+    # Derived frames are built with copying operations instead of inplace updates.
+    groups = {}
+    for column, dtype in df.dtypes.items():
+        groups.setdefault(dtype, []).append(column)
+
+    # One read-only array per dtype, pandas never consolidates it into a writable copy.
+    # Extension arrays have no read-only flag and are left as they are.
+    frames = []
+    for dtype, columns in groups.items():
+        if not isinstance(dtype, np.dtype):
+            frames.append(df[columns])
+            continue
+
+        values = df[columns].to_numpy(dtype=dtype)
+        values.flags.writeable = False
+        frames.append(pd.DataFrame(values, index=df.index, columns=columns, copy=False))
+
+    return pd.concat(frames, axis=1, copy=False) if frames else df
 
 def _get_variable(field_name: str, variables) -> Variable:
     return variables[field_name].value
 
-def _split_multiple_values(value):
-    if not pd.isna(value):
-        return [item.strip() for item in re.split(rf'\{Multivalue.SEPARATOR.value}', value)] 
-    
-    return [value]
+def _build_multivalue_index(values: pd.Series, multiple: bool) -> MultivalueIndex:
+    values = values.reset_index(drop=True)
+
+    if not Policies.DROP_NA.value:
+        values = values.fillna('')
+
+    # Split the values by the multivalue character, one row per item
+    items = values[values.notna()]
+    if multiple:
+        items = items.astype(str).str.split(Multivalue.SEPARATOR.value, regex=False).explode().str.strip()
+
+    # Sorted categories give every variable the same code dictionary across loads
+    codes, categories = pd.factorize(items, sort=True)
+
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(items.index.to_numpy(dtype=np.int64), minlength=len(values)), out=offsets[1:])
+
+    return MultivalueIndex(offsets, codes, np.asarray(categories, dtype=object), (values == '').to_numpy())
+
+def _top_categories(counts: np.ndarray, top: int | None) -> np.ndarray:
+    kept = np.ones(len(counts), dtype=bool)
+    if top is None or len(counts) <= top: return kept
+
+    if top < 1: raise ValueError(f'At least one category must be kept, got {top}')
+
+    # The smallest kept count is found without sorting, its ties are kept in the order of the categories
+    threshold = counts[np.argpartition(counts, len(counts) - top)[len(counts) - top]]
+    kept = counts > threshold
+    kept[np.flatnonzero(counts == threshold)[:top - kept.sum()]] = True
+
+    return kept
+
+def _kept_categories(freq_table: pd.DataFrame, top: int | None) -> np.ndarray | None:
+    if top is None: return None
+
+    # Blank values are not a category, they never take a place in the top and are never folded.
+    # An existing Other category does not take a place in the top either, the folded categories are merged into it.
+    values, counts = freq_table['value'].to_numpy(), freq_table['n'].to_numpy()
+    candidates = (values != '') & (values != Folding.OTHER.value)
+
+    return values[candidates][_top_categories(counts[candidates], top)]
+
+def _fold_categories(categories: np.ndarray, kept_categories: np.ndarray | None):
+    # Map every category to its folded code, the folded categories come last
+    if kept_categories is None: return np.arange(len(categories)), categories
+
+    kept = np.isin(categories, kept_categories) | (categories == '')
+    if kept.all(): return np.arange(len(categories)), categories
 
-def _process_multiple_values(values: pd.Series, multiple: bool):
-    if (multiple):
-        return values.apply(lambda x: _split_multiple_values(x))
+    codes = np.full(len(categories), kept.sum())
+    codes[kept] = np.arange(kept.sum())
 
-    return values.apply(lambda x: [x])
+    return codes, np.append(categories[kept], Folding.OTHER.value)
 
 def _dataframe_get_title(statistic_type: str, statistic_name: str,
                           variable_name: str, comparison_variable_name = None):
@@ -148,12 +776,16 @@ def _display_figure(plt):
     if not bool:
         return
     
-    if isinstance(plt, Text):
+    if isinstance(plt, text.Text):
         print(plt.get_text())
         print(_no_data_message())
         print('\n')
         return
-    else: plt.show()
+
+    # Without a window to display the figure in, the figure is reused by the next plot
+    if figure_pool.interactive():
+        plt.show()
+        figure_pool.release(plt)
 
 ### Data
 
@@ -162,9 +794,50 @@ def _display_figure(plt):
 data_cache = DataCache()
 
 {# The data should be at the root of the project, with the name of the project as the name of the .csv #}
-def _read_project_classification_data(path = './{{attribute(export_config,'CLASSIFICATION_FILE_NAME')}}'):
+CLASSIFICATION_DATA_PATH = './{{attribute(export_config,'CLASSIFICATION_FILE_NAME')}}'
+
+def _read_project_classification_data(path = CLASSIFICATION_DATA_PATH):
     return data_cache.load_csv(path, 'utf8')
 
+def _dump_multivalue_indexes(indexes: dict[str, MultivalueIndex]) -> dict[str, np.ndarray]:
+    arrays = {}
+    for field_name, index in indexes.items():
+        arrays[f'{field_name}.offsets'] = index.offsets
+        arrays[f'{field_name}.codes'] = index.codes
+        arrays[f'{field_name}.categories'] = np.asarray(index.categories, dtype=str)
+        arrays[f'{field_name}.blank'] = index.blank
+    return arrays
+
+def _restore_multivalue_indexes(arrays: dict[str, np.ndarray]) -> dict[str, MultivalueIndex]:
+    return {
+        variable.name: MultivalueIndex(arrays[f'{variable.name}.offsets'], arrays[f'{variable.name}.codes'],
+                                       arrays[f'{variable.name}.categories'].astype(object),
+                                       arrays[f'{variable.name}.blank'])
+        for variable in NominalVariables
+    }
+
+def _read_classification_chunks(file_path: str, encoding: str, chunksize: int | None, columns = ()):
+    # Only the columns of the variables are parsed, free text columns are skipped
+    chunks = pd.read_csv(file_path, encoding=encoding, dtype=_classification_dtypes(),
+                         usecols=list(_classification_dtypes()) + list(columns), chunksize=chunksize)
+    return [chunks] if chunksize is None else chunks
+
+def _apply_classification_delta(counts: ClassificationCounts, delta_path: str, encoding: str, chunksize: int | None):
+    # A changed paper is listed twice, removed with its previous values and added with its new ones
+    for chunk in _read_classification_chunks(delta_path, encoding, chunksize, [Delta.OPERATION.value]):
+        operations = chunk[Delta.OPERATION.value].astype(str).str.strip().str.lower()
+        unknown = set(operations) - {Delta.ADDED.value, Delta.REMOVED.value}
+        if unknown:
+            raise ValueError(f"Unknown delta operations in {delta_path}: {', '.join(sorted(unknown))}")
+
+        counts.update(chunk[(operations == Delta.ADDED.value).to_numpy()], 1)
+        counts.update(chunk[(operations == Delta.REMOVED.value).to_numpy()], -1)
+
+    # A removed paper must match the cells of a counted one, not only its categories
+    if ((counts.counts < 0).any() or (counts.weights < 0).any()
+            or (counts.matrix.data < 0).any() or (counts.year_matrix.data < 0).any()):
+        raise ValueError(f'{delta_path} removes papers which are not in the classification data')
+
 def _aggregate_variables_by_data_type(variables: type[NominalVariables] | type[ContinuousVariables]):
     return {variable.value.title: variable.name for variable in variables}
 
@@ -172,61 +845,98 @@ def _transform_classification_data(project_classification_data: pd.DataFrame, ag
     data = project_classification_data[aggregated_variables.keys()].rename(columns=aggregated_variables)
 
     if not Policies.DROP_NA.value:
-        _substitute_nan(data)
+        data = _substitute_nan(data)
 
     return data
 
+def _transform_continuous_data(project_classification_data: pd.DataFrame, aggregated_variables: dict[str, str]):
+    return project_classification_data[aggregated_variables.keys()].astype('float64').rename(columns=aggregated_variables)
+
 ## Preprocessing
 
-def _nominal_dataframe():
-    project_classification_data = _read_project_classification_data()
-    aggregated_variables = _aggregate_variables_by_data_type(NominalVariables)
-    nominal_data = _transform_classification_data(project_classification_data, aggregated_variables)
-    return NominalDataFrame(nominal_data, NominalVariables)
+def _build_dataframe(project_classification_data: pd.DataFrame,
+                     variable_type: Type[NominalVariables] | Type[ContinuousVariables],
+                     dataframe_type: Type[NominalDataFrame] | Type[ContinuousDataFrame]):
+    aggregated_variables = _aggregate_variables_by_data_type(variable_type)
 
-def _continuous_dataframe():
-    project_classification_data = _read_project_classification_data()
-    aggregated_variables = _aggregate_variables_by_data_type(ContinuousVariables)
-    continuous_data = _transform_classification_data(project_classification_data, aggregated_variables)
-    return ContinuousDataFrame(continuous_data, ContinuousVariables)
+    if dataframe_type is ContinuousDataFrame:
+        data = _transform_continuous_data(project_classification_data, aggregated_variables)
+    else:
+        data = _transform_classification_data(project_classification_data, aggregated_variables)
 
-### DESCRIPTIVE STATS
+    return dataframe_type(_freeze_dataframe(data), variable_type)
 
-## Util
+def _dump_dataframe(dataframe: ContinuousDataFrame) -> dict[str, np.ndarray]:
+    return {'values': dataframe.data.to_numpy(dtype=np.float64)}
+
+def _restore_dataframe(arrays: dict[str, np.ndarray], variable_type: Type[ContinuousVariables]):
+    # The memory mapped values are read-only already, the frame is a single block over them
+    data = pd.DataFrame(arrays['values'], columns=[variable.name for variable in variable_type], copy=False)
+
+    return ContinuousDataFrame(data, variable_type)
 
-def _beautify_data_desc(field_name: str, data: pd.DataFrame):
-    # Get metadata
-    variable = _get_variable(field_name, NominalVariables)
+def _nominal_dataframe(path = CLASSIFICATION_DATA_PATH) -> NominalDataFrame:
+    return data_cache.load_dataframe(path, 'utf8', NominalVariables, NominalDataFrame)
 
-    # Split the values by the multivalue character and flatten the result
-    split_values = _process_multiple_values(data[field_name], variable.multiple)
-    flattened_values = np.concatenate(split_values)
+def _continuous_dataframe(path = CLASSIFICATION_DATA_PATH) -> ContinuousDataFrame:
+    return data_cache.load_dataframe(path, 'utf8', ContinuousVariables, ContinuousDataFrame)
 
-    # Generate the frequency table
-    freq_table = pd.Series(flattened_values, dtype=str).value_counts().reset_index()
-    freq_table.columns = ['value', 'n']
+### DESCRIPTIVE STATS
+
+## Util
+
+def _beautify_data_desc(categories: np.ndarray, counts: np.ndarray):
+    # Generate the frequency table, most frequent values first
+    order = np.argsort(-counts, kind='stable')
+    freq_table = pd.DataFrame({'value': categories[order], 'n': counts[order]})
 
     # Calculate the percentage
     freq_table['percentage'] = (freq_table['n'] / freq_table['n'].sum()) * 100
 
     return freq_table
 
+def _fold_frequency_table(freq_table: pd.DataFrame, kept_categories: np.ndarray | None):
+    values = freq_table['value'].to_numpy()
+    codes, categories = _fold_categories(values, kept_categories)
+    if np.array_equal(categories, values): return freq_table.copy()
+
+    counts = freq_table['n'].to_numpy()
+    n = np.bincount(codes, weights=counts, minlength=len(categories)).astype(counts.dtype)
+    subset_data = pd.DataFrame({'value': categories, 'n': n, 'percentage': n / counts.sum() * 100})
+
+    _dataframe_update_title(subset_data, freq_table.attrs)
+
+    return subset_data
+
+def _count_multivalue_indexes(indexes: dict[str, MultivalueIndex]) -> np.ndarray:
+    codes, size = _stacked_codes(indexes)
+    return np.bincount(codes, minlength=size)
+
+def _build_frequency_tables(categories: dict[str, np.ndarray], counts: np.ndarray):
+    freq_tables = {}
+    for field_name, (start, end) in _category_bounds(categories).items():
+        freq_table = _beautify_data_desc(categories[field_name], counts[start:end])
+        variable = _get_variable(field_name, NominalVariables)
+        _dataframe_update_title(freq_table, _dataframe_get_title('Descriptive', 'Frequency tables', variable.title))
+        freq_tables[field_name] = freq_table
+
+    return freq_tables
+
+def _desc_frequency_tables(path = CLASSIFICATION_DATA_PATH) -> dict[str, pd.DataFrame]:
+    return data_cache.load_frequency_tables(path, 'utf8')
+
 ## Frequency tables
 
 def _desc_frequency_table(classification_variable: NominalVariables):
-    df = _nominal_dataframe().data
-
     variable = classification_variable.value
     
     df_title = _dataframe_get_title('Descriptive', 'Frequency tables', variable.title)
+
+    df = _desc_frequency_tables()[variable.name]
     
     if df.empty: return _create_empty_dataframe(df_title, _dataframe_update_title)
 
-    subset_data = _beautify_data_desc(variable.name, df)
-
-    _dataframe_update_title(subset_data, df_title)
-
-    return subset_data
+    return _fold_frequency_table(df, _kept_categories(df, variable.top))
 
 def desc_frequency_table(classification_variable: NominalVariables, show: bool):
     if not show: return
@@ -234,24 +944,28 @@ def desc_frequency_table(classification_variable: NominalVariables, show: bool):
     data = _desc_frequency_table(classification_variable)
     _display_data(data)
 
+def desc_frequency_tables(show: bool):
+    if not show: return
+
+    for field_name, data in _desc_frequency_tables().items():
+        _display_data(_fold_frequency_table(data, _kept_categories(data, _get_variable(field_name, NominalVariables).top)))
+
 ## Bar plots
 
 def _desc_bar_plot(classification_variable: NominalVariables):
-    df = _nominal_dataframe().data
-
     variable = classification_variable.value
 
     # Set labels and title
     title = f"{variable.title} ~ Bar plot"
-    
-    if df.empty: return plt.title(title)
 
-    df = _beautify_data_desc(variable.name, df)
+    df = _desc_frequency_tables()[variable.name]
+
+    if df.empty: return figure_pool.title(title) 
 
-    if df.empty: return plt.title(title) 
+    df = _fold_frequency_table(df, _kept_categories(df, variable.top))
 
     # Create the plot
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = figure_pool.create()
     hue = 'n'
     sns.barplot(data=df, x='value', y='percentage', hue=hue, dodge=False) # type: ignore
 
@@ -270,6 +984,76 @@ def desc_bar_plot(classification_variable: NominalVariables, show: bool):
 
 ## Statistics
 
+def _sorted_quantile(ordered: np.ndarray, n: np.ndarray, q: float):
+    # Linear interpolation between the closest ranks of every sorted column, missing values sorted last
+    position = np.maximum(n - 1, 0) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    lower_values = np.take_along_axis(ordered, lower[np.newaxis], axis=0)[0]
+    upper_values = np.take_along_axis(ordered, upper[np.newaxis], axis=0)[0]
+    return np.where(n > 0, lower_values + (position - lower) * (upper_values - lower_values), np.nan)
+
+def _build_descriptive_statistics(data: pd.DataFrame):
+    values = data.to_numpy(dtype=np.float64)
+
+    # Without papers a single missing row keeps the shape of the sorted columns, every statistic is undefined
+    if values.shape[0] == 0: values = np.full((1, values.shape[1]), np.nan)
+
+    missing = np.isnan(values)
+    n = (~missing).sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # One sort per column serves the median, the quartiles of the trimmed mean and the extremes
+        ordered = np.sort(values, axis=0)
+        median = _sorted_quantile(ordered, n, 0.5)
+        lower_quartile = _sorted_quantile(ordered, n, 0.25)
+        upper_quartile = _sorted_quantile(ordered, n, 0.75)
+        minimum = np.where(n > 0, ordered[0], np.nan)
+        maximum = _sorted_quantile(ordered, n, 1)
+
+        inner = (values >= lower_quartile) & (values <= upper_quartile)
+        trimmed = np.where(inner, values, 0).sum(axis=0) / inner.sum(axis=0)
+
+        # Median absolute deviation scaled by the upper quartile of the normal distribution, undefined with missing values
+        deviations = np.sort(np.abs(values - median), axis=0)
+        median_deviation = np.where(missing.any(axis=0), np.nan, _sorted_quantile(deviations, n, 0.5) / 0.6744897501960817)
+
+        # Shared central moments for the standard deviation, skew and kurtosis
+        mean = np.nansum(values, axis=0) / n
+        centered = np.where(missing, 0, values - mean)
+        m2 = (centered ** 2).sum(axis=0)
+        sd = np.sqrt(m2 / np.maximum(n - 1, 0))
+        m2 = m2 / n
+        m3 = (centered ** 3).sum(axis=0) / n
+        m4 = (centered ** 4).sum(axis=0) / n
+
+        undefined = m2 <= (np.finfo(np.float64).resolution * mean) ** 2
+        if not Policies.DROP_NA.value:
+            undefined |= missing.any(axis=0)
+
+        results = {
+        'vars': np.arange(1, values.shape[1] + 1),
+        'n': n,
+        'mean': mean,
+        'sd': sd,
+        'median': median,
+        'trimmed': trimmed,
+        'mad': median_deviation,
+        'min': minimum,
+        'max': maximum,
+        'range': maximum - minimum,
+        'skew': np.where(undefined, np.nan, m3 / m2 ** 1.5),
+        'kurtosis': np.where(undefined, np.nan, m4 / m2 ** 2 - 3),
+        'se': sd / np.sqrt(n)
+        }
+
+    titles = [_get_variable(field_name, ContinuousVariables).title for field_name in data.columns]
+
+    return pd.DataFrame(results, index=titles)
+
+def _read_descriptive_statistics(path = CLASSIFICATION_DATA_PATH) -> pd.DataFrame:
+    return data_cache.load_descriptive_statistics(path, 'utf8')
+
 def _desc_statistics(classification_variable: ContinuousVariables):
     df = _continuous_dataframe().data
 
@@ -280,27 +1064,9 @@ def _desc_statistics(classification_variable: ContinuousVariables):
     df_title = _dataframe_get_title('Descriptive', 'Statistics', variable.title)
     
     if series.empty: return _create_empty_dataframe(df_title, _dataframe_update_title)
-    
-    series.replace('', np.nan, inplace=True)
-
-    nan_policy = 'omit' if Policies.DROP_NA.value else 'propagate'
-    results = {
-    'vars': 1,
-    'n': series.count(),
-    'mean': series.mean(),
-    'sd': series.std(),
-    'median': series.median(),
-    'trimmed': series[series.between(series.quantile(0.25), series.quantile(0.75))].mean(),
-    'mad': mad(series),
-    'min': series.min(),
-    'max': series.max(),
-    'range': series.max() - series.min(),
-    'skew': skew(series, nan_policy=nan_policy),
-    'kurtosis': kurtosis(series, nan_policy=nan_policy, fisher=True),
-    'se': series.std() / np.sqrt(series.count())  
-    }
 
-    subset_data = pd.DataFrame(results, index=[0])
+    subset_data = _read_descriptive_statistics().loc[[variable.title]].reset_index(drop=True)
+    subset_data['vars'] = 1
 
     _dataframe_update_title(subset_data, df_title)
 
@@ -312,6 +1078,20 @@ def desc_statistics(classification_variable: ContinuousVariables, show: bool):
     data = _desc_statistics(classification_variable)
     _display_data(data)
 
+def _desc_statistics_all():
+    subset_data = _read_descriptive_statistics().copy()
+
+    _dataframe_update_title(subset_data, _dataframe_get_title('Descriptive', 'Statistics',
+                                                              ', '.join(subset_data.index)))
+
+    return subset_data
+
+def desc_statistics_all(show: bool):
+    if not show: return
+
+    data = _desc_statistics_all()
+    _display_data(data)
+
 ## Box Plots
 
 def _desc_box_plot(classification_variable: ContinuousVariables):
@@ -324,10 +1104,10 @@ def _desc_box_plot(classification_variable: ContinuousVariables):
     # Set the title and labels
     title = f"{variable.title} ~ Box plot"
 
-    if series.empty: return plt.title(title)
+    if series.empty: return figure_pool.title(title)
 
     # Create the box plot
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = figure_pool.create()
     sns.boxplot(data=series, color='lightblue')
 
     # Overlay the mean point
@@ -358,9 +1138,9 @@ def _desc_violin_plot(classification_variable: ContinuousVariables):
     
     title = f"{variable.title} ~ Violin plot"
 
-    if series.empty: return plt.title(title)
+    if series.empty: return figure_pool.title(title)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = figure_pool.create()
     sns.violinplot(data=series, color='lightgray')
 
     plt.title(title)
@@ -380,40 +1160,75 @@ def desc_violin_plot(classification_variable: ContinuousVariables, show: bool):
 
 ## Util
 
-def _beautify_data_evo(field_name: str, publication_year: pd.Series, variable: Variable, data: pd.DataFrame):
-    series = data[field_name]
-    
-    # Create new DataFrame with specified columns
+def _build_evolution_tables(publication_year: pd.Series, indexes: dict[str, MultivalueIndex]):
+    codes, size = _stacked_codes(indexes)
+    rows = np.concatenate([index.rows() for index in indexes.values()])
+
+    # Remove items without a publication year
+    years = publication_year.to_numpy()[rows]
+    kept = ~np.isnan(years)
+
+    year_values, year_codes = np.unique(years[kept].astype(np.int64), return_inverse=True)
+
+    # Counting occurrences of every (year, category) code pair
+    frequencies = np.bincount(year_codes * size + codes[kept], minlength=len(year_values) * size)
+
+    return EvolutionTables(year_values, frequencies.reshape(len(year_values), size),
+                           {field_name: index.categories for field_name, index in indexes.items()})
+
+def _read_evolution_tables(path = CLASSIFICATION_DATA_PATH) -> EvolutionTables:
+    return data_cache.load_evolution_tables(path, 'utf8')
+
+def _beautify_data_evo(field_name: str):
+    years, categories, frequencies = _read_evolution_tables().table(field_name)
+
+    # The (year, category) pairs are listed by year and category
+    year_codes, category_codes = np.nonzero(frequencies)
+
     subset_data = pd.DataFrame({
-        'Year': publication_year,
-        'Value': _process_multiple_values(series, variable.multiple)
+        'Year': years[year_codes],
+        'Value': categories[category_codes],
+        'Frequency': frequencies[year_codes, category_codes]
     })
-    
-    subset_data = subset_data.explode('Value')
 
-    # Remove rows with empty values
-    subset_data = subset_data[(subset_data['Value'] != '')]
+    return subset_data
+
+def _window_frequencies(years: np.ndarray, frequencies: np.ndarray, window: int | None):
+    # Prefix sums give the frequencies of any window of years with two lookups
+    prefix = np.zeros((len(years) + 1, frequencies.shape[1]), dtype=np.int64)
+    np.cumsum(frequencies, axis=0, out=prefix[1:])
+
+    if window is None: return prefix[1:]
 
-    subset_data = subset_data.groupby(['Year', 'Value']).size().reset_index(name='Frequency')
+    if window < 1: raise ValueError(f'The rolling window must be at least one year, got {window}')
+
+    # Every window ends with its year and starts window - 1 years before
+    starts = np.searchsorted(years, years - window + 1)
+    return prefix[1:] - prefix[starts]
+
+def _beautify_data_evo_window(field_name: str, window: int | None, share: bool):
+    years, categories, frequencies = _read_evolution_tables().table(field_name)
+
+    frequencies = _window_frequencies(years, frequencies, window)
+
+    # Calculate the percentage of every category within its window
+    if share: frequencies = frequencies / frequencies.sum(axis=1, keepdims=True) * 100
+
+    subset_data = pd.DataFrame(frequencies, columns=categories)
+    subset_data.insert(0, 'Year', years)
 
     return subset_data
 
 ## Frequency tables
 
 def _evo_frequency_table(classification_variable: NominalVariables):
-    df = _nominal_dataframe().data
-
-    publication_year = _continuous_dataframe().data["publication_year"]
-
     variable = classification_variable.value
 
-    subset_data = _beautify_data_evo(variable.name, publication_year, variable, df)
+    years, categories, frequencies = _read_evolution_tables().table(variable.name)
 
-    # Pivoting the data
-    subset_data = subset_data.pivot(index='Year', columns='Value', values='Frequency').replace('', np.nan).fillna(0)
-
-    subset_data.columns.name = None
-    subset_data.reset_index(inplace=True)
+    # One row per year and one column per category
+    subset_data = pd.DataFrame(frequencies, columns=categories)
+    subset_data.insert(0, 'Year', years)
 
     _dataframe_update_title(subset_data, _dataframe_get_title('Evolutive', 'Frequency tables', variable.title))
 
@@ -425,23 +1240,55 @@ def evo_frequency_table(classification_variable: NominalVariables, show: bool):
     data = _evo_frequency_table(classification_variable)
     _display_data(data)
 
-## Evolution Plots
+## Cumulative frequency tables
 
-def _evo_plot(classification_variable: NominalVariables):
-    df = _nominal_dataframe().data
+def _evo_cumulative_frequency_table(classification_variable: NominalVariables, share = False):
+    variable = classification_variable.value
+
+    subset_data = _beautify_data_evo_window(variable.name, None, share)
+
+    statistic_name = 'Cumulative shares' if share else 'Cumulative frequency tables'
+    _dataframe_update_title(subset_data, _dataframe_get_title('Evolutive', statistic_name, variable.title))
+
+    return subset_data
+
+def evo_cumulative_frequency_table(classification_variable: NominalVariables, share: bool, show: bool):
+    if not show: return
 
-    publication_year = _continuous_dataframe().data["publication_year"]
+    data = _evo_cumulative_frequency_table(classification_variable, share)
+    _display_data(data)
 
+## Rolling frequency tables
+
+def _evo_rolling_frequency_table(classification_variable: NominalVariables, window = 3, share = False):
+    variable = classification_variable.value
+
+    subset_data = _beautify_data_evo_window(variable.name, window, share)
+
+    statistic_name = f"{window}-year rolling {'shares' if share else 'frequency tables'}"
+    _dataframe_update_title(subset_data, _dataframe_get_title('Evolutive', statistic_name, variable.title))
+
+    return subset_data
+
+def evo_rolling_frequency_table(classification_variable: NominalVariables, window: int, share: bool, show: bool):
+    if not show: return
+
+    data = _evo_rolling_frequency_table(classification_variable, window, share)
+    _display_data(data)
+
+## Evolution Plots
+
+def _evo_plot(classification_variable: NominalVariables):
     variable = classification_variable.value
     
-    subset_data = _beautify_data_evo(variable.name, publication_year, variable, df)
+    subset_data = _beautify_data_evo(variable.name)
 
     title = f"{variable.title} ~ Evolution plot"
 
-    if subset_data.empty: return plt.title(title)
+    if subset_data.empty: return figure_pool.title(title)
 
     # Create a plot
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = figure_pool.create()
     hue = 'Value'
     sns.lineplot(data=subset_data, x='Year', y='Frequency', hue=hue, style='Value', markers=True)
 
@@ -464,40 +1311,95 @@ def evo_plot(classification_variable: NominalVariables, show: bool):
 
 ## Util
 
-def _beautify_data_comp(field_name: str, comparison_variable_name: str,
-                        variable: Variable, comparison_variable: Variable, data: pd.DataFrame):    
+def _build_contingency_tables(indexes: dict[str, MultivalueIndex]):
+    # A single product of the one-hot matrices counts the co-occurrences of all the pairs of variables
+    indicators = sparse.hstack([index.indicator() for index in indexes.values()], format='csr')
+    matrix = (indicators.T @ indicators).tocsr()
+    matrix.eliminate_zeros()
+    matrix.sort_indices()
+
+    return ContingencyTables(matrix, {field_name: index.categories for field_name, index in indexes.items()})
+
+def _read_contingency_tables(path = CLASSIFICATION_DATA_PATH) -> ContingencyTables:
+    return data_cache.load_contingency_tables(path, 'utf8')
+
+def _fold_contingency_table(field_name: str, comparison_variable_name: str):
+    contingency_tables = _read_contingency_tables()
+    table = contingency_tables.table(field_name, comparison_variable_name)
+
+    # The categories are kept from the same frequency tables as the descriptive statistics,
+    # the folded cells are summed by the conversion
+    freq_tables = _desc_frequency_tables()
+    (codes, categories), (comparison_codes, comparison_categories) = [
+        _fold_categories(contingency_tables.categories[name],
+                         _kept_categories(freq_tables[name], _get_variable(name, NominalVariables).top))
+        for name in (field_name, comparison_variable_name)
+    ]
+
+    table = sparse.coo_matrix((table.data, (codes[table.row], comparison_codes[table.col])),
+                              shape=(len(categories), len(comparison_categories))).tocsr().tocoo()
+
+    return table, categories, comparison_categories
+
+def _beautify_data_comp(field_name: str, comparison_variable_name: str):
+    # Rows where any of the variables is empty were left out of the table
+    table, categories, comparison_categories = _fold_contingency_table(field_name, comparison_variable_name)
+    order = np.lexsort((table.col, table.row))
+
     subset_data = pd.DataFrame({
-        field_name: data[field_name],
-        comparison_variable_name: data[comparison_variable_name]
+        field_name: categories[table.row[order]],
+        comparison_variable_name: comparison_categories[table.col[order]],
+        'Frequency': table.data[order]
     })
-    
-    # Filtering out rows where any of the variables is empty
-    subset_data = subset_data[(subset_data[field_name] != '') & (subset_data[comparison_variable_name] != '')]
 
-    # Splitting the strings and expanding into separate rows
-    subset_data[field_name] = _process_multiple_values(subset_data[field_name], variable.multiple)
-    subset_data = subset_data.explode(field_name)
+    return subset_data
+
+def _observed_categories(table: sparse.coo_matrix):
+    observed = table.data != 0
+    return np.unique(table.row[observed]), np.unique(table.col[observed])
 
-    subset_data[comparison_variable_name] = _process_multiple_values(subset_data[comparison_variable_name],
-                                                                  comparison_variable.multiple)
-    subset_data = subset_data.explode(comparison_variable_name)
+def _correlation_matrix(values: np.ndarray):
+    # Standardized columns turn all the pairwise coefficients into a single matrix product
+    centered = values - values.mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        standardized = centered / np.sqrt((centered ** 2).sum(axis=0))
+    coefficients = np.clip(standardized.T @ standardized, -1, 1)
 
-    # Counting occurrences
-    subset_data = subset_data.groupby([field_name, comparison_variable_name]).size().reset_index(name='Frequency')
+    # Two-sided p-values from the exact distribution of the coefficient, as scipy's pearsonr
+    shape = len(values) / 2 - 1
+    p_values = 2 * stats.beta.cdf(-np.abs(coefficients), shape, shape, loc=-1, scale=2)
 
-    return subset_data
+    return coefficients, p_values
+
+def _beautify_data_cor(classification_variables: list[ContinuousVariables], ranked: bool, normal: bool):
+    variables = [classification_variable.value for classification_variable in classification_variables]
+    values = _continuous_dataframe().data[[variable.name for variable in variables]].fillna(0).to_numpy()
+
+    if ranked: values = stats.rankdata(values, axis=0)
+
+    coefficients, p_values = _correlation_matrix(values)
+
+    # Keep the pairs whose Shapiro Wilk's tests allow the correlation test
+    shapiro_results = [_read_shapiro_wilk_test(variable.name) for variable in variables]
+
+    pairs = []
+    for i, variable in enumerate(variables):
+        for j in range(i + 1, len(variables)):
+            if shapiro_results[i] is None or shapiro_results[j] is None: continue
+            if (shapiro_results[i].pvalue > 0.05 and shapiro_results[j].pvalue > 0.05) != normal: continue
+
+            pairs.append((variable.title, variables[j].title, coefficients[i, j], p_values[i, j]))
+
+    return pd.DataFrame(pairs, columns=['variable', 'comparison variable', 'coefficient', 'p-value'])
 
 ## Frequency Tables
 
 def _comp_frequency_table(classification_variable: NominalVariables,
                               comparison_classification_variable: NominalVariables):
-    data = _nominal_dataframe().data
-
     variable = classification_variable.value
     comparison_variable = comparison_classification_variable.value
 
-    subset_data = _beautify_data_comp(variable.name, comparison_variable.name,
-                                      variable, comparison_variable, data)
+    subset_data = _beautify_data_comp(variable.name, comparison_variable.name)
     
     _dataframe_update_title(subset_data, _dataframe_get_title('Comparative', 'Frequency tables',
                                                                  variable.title, comparison_variable.title))
@@ -515,32 +1417,28 @@ def comp_frequency_table(classification_variable: NominalVariables,
 
 def _comp_stacked_bar_plot(classification_variable: NominalVariables,
                               comparison_classification_variable: NominalVariables):
-    data = _nominal_dataframe().data
-
     variable = classification_variable.value
     comparison_variable = comparison_classification_variable.value
 
-    subset_data = _beautify_data_comp(variable.name, comparison_variable.name,
-                                      variable, comparison_variable, data)
+    table, categories, comparison_categories = _fold_contingency_table(variable.name, comparison_variable.name)
 
     title = f"{variable.title} and {comparison_variable.title} ~ Stacked bar plot"
 
-    if subset_data.empty: return plt.title(title)
+    if table.nnz == 0: return figure_pool.title(title)
 
-    # Pivot the data to get a matrix form
-    pivoted_data = subset_data.pivot(index=variable.name, columns=comparison_variable.name, values='Frequency')
+    # Only the categories which co-occur are densified, every stack needs all of its segments
+    rows, columns = _observed_categories(table)
+    frequencies = _trim_contingency_table(table).astype(float)
+    categories, comparison_categories = categories[rows], comparison_categories[columns]
 
-    # Replace NaN values with 0
-    pivoted_data = pivoted_data.replace('', np.nan).fillna(0)
-
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = figure_pool.create()
 
     # Bottom value for stacking
-    bottom_value = pd.Series([0] * pivoted_data.shape[0], index=pivoted_data.index)
+    bottom_value = np.zeros(len(categories))
 
-    for col in pivoted_data.columns:
-        plt.bar(pivoted_data.index, pivoted_data[col], bottom=bottom_value, label=col)
-        bottom_value += pivoted_data[col]
+    for category, column in zip(comparison_categories, frequencies.T):
+        plt.bar(categories, column, bottom=bottom_value, label=category)
+        bottom_value += column
 
     plt.title(title)
     plt.xlabel(variable.title)
@@ -560,19 +1458,16 @@ def comp_stacked_bar_plot(classification_variable: NominalVariables,
 
 def _comp_grouped_bar_plot(classification_variable: NominalVariables,
                               comparison_classification_variable: NominalVariables):
-    data = _nominal_dataframe().data
-
     variable = classification_variable.value
     comparison_variable = comparison_classification_variable.value
 
-    subset_data = _beautify_data_comp(variable.name, comparison_variable.name,
-                                      variable, comparison_variable, data)
+    subset_data = _beautify_data_comp(variable.name, comparison_variable.name)
     
     title = f"{variable.title} and {comparison_variable.title} ~ Grouped bar plot"
 
-    if subset_data.empty: return plt.title(title)
+    if subset_data.empty: return figure_pool.title(title)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = figure_pool.create()
     sns.barplot(x=variable.name, y='Frequency', hue=comparison_variable.name, data=subset_data)
 
     plt.title(title)
@@ -593,20 +1488,17 @@ def comp_grouped_bar_plot(classification_variable: NominalVariables,
 
 def _comp_bubble_chart(classification_variable: NominalVariables,
                               comparison_classification_variable: NominalVariables):
-    data = _nominal_dataframe().data
-
     variable = classification_variable.value
     comparison_variable = comparison_classification_variable.value
 
-    subset_data = _beautify_data_comp(variable.name, comparison_variable.name,
-                                      variable, comparison_variable, data)
+    subset_data = _beautify_data_comp(variable.name, comparison_variable.name)
 
     title = f"{variable.title} and {comparison_variable.title} ~ Bubble Chart"
 
-    if subset_data.empty: return plt.title(title)
+    if subset_data.empty: return figure_pool.title(title)
 
     # Creating the bubble chart
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = figure_pool.create()
     size = 'Frequency'
     sns.scatterplot(data=subset_data, x=variable.name, y=comparison_variable.name, size=size, color='black')
 
@@ -627,37 +1519,146 @@ def comp_bubble_chart(classification_variable: NominalVariables,
 
 ## Chi-squared test
 
+def _trim_contingency_table(table: sparse.coo_matrix):
+    # Categories which never co-occur have no expected frequency, only the observed block is densified
+    rows, columns = _observed_categories(table)
+    return table.tocsr()[rows][:, columns].toarray()
+
+def _build_chi_squared_tests(contingency_tables: ContingencyTables):
+    # The tests are run on all the categories, whatever the folding of the tables and plots
+    field_names = list(contingency_tables.bounds)
+    size = len(field_names)
+    sizes = [len(contingency_tables.categories[field_name]) for field_name in field_names]
+    owners = np.repeat(np.arange(size), sizes)
+
+    # Marginals of every category against every variable, shared by all the pairs
+    membership = sparse.csr_matrix((np.ones(len(owners)), owners, np.arange(len(owners) + 1)),
+                                   shape=(len(owners), size))
+    marginals = (contingency_tables.matrix @ membership).toarray()
+    totals = membership.T @ marginals
+    dimensions = (membership.T @ (marginals > 0).astype(np.int64)).astype(np.int64)
+    dof = (dimensions - 1) * (dimensions.T - 1)
+
+    # Pearson statistic of all the pairs from the observed cells, sum((O - E)^2 / E) = sum((O - E)^2 / E - E) + N
+    matrix = contingency_tables.matrix.tocoo()
+    owner, comparison_owner = owners[matrix.row], owners[matrix.col]
+    expected = marginals[matrix.row, comparison_owner] * marginals[matrix.col, owner] / totals[owner, comparison_owner]
+    contributions = (matrix.data - expected) ** 2 / expected - expected
+    statistics = np.bincount(owner * size + comparison_owner, weights=contributions,
+                             minlength=size * size).reshape(size, size) + totals
+    statistics = np.where(dof > 0, np.maximum(statistics, 0), 0)
+
+    tests = []
+    for i, field_name in enumerate(field_names):
+        for j, comparison_field_name in enumerate(field_names):
+            if i == j: continue
+
+            statistic, p_value = statistics[i, j], stats.chi2.sf(statistics[i, j], dof[i, j]) if dof[i, j] > 0 else 1.0
+            if totals[i, j] == 0:
+                statistic, p_value = np.nan, np.nan
+            elif dof[i, j] == 1:
+                # Yates' continuity correction applies to 2x2 tables
+                table = _trim_contingency_table(contingency_tables.table(field_name, comparison_field_name))
+                statistic, p_value = stats.chi2_contingency(table)[:2]
+
+            tests.append((field_name, comparison_field_name, statistic, p_value, dof[i, j]))
+
+    return pd.DataFrame(tests, columns=['variable', 'comparison variable', 'statistic', 'p-value', 'dof']) \
+        .set_index(['variable', 'comparison variable'])
+
+def _read_chi_squared_tests(path = CLASSIFICATION_DATA_PATH) -> pd.DataFrame:
+    return data_cache.load_chi_squared_tests(path, 'utf8')
+
+## Fisher's test
+
+def _small_expected_frequencies(table: np.ndarray):
+    # Cochran's rule, the chi-squared approximation needs expected frequencies of at least 1 in all the cells
+    # and of at least 5 in 80% of them
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / table.sum()
+    return (expected < 1).any() or (expected < FisherTest.MIN_EXPECTED.value).mean() > 0.2
+
+def _table_log_weights(tables: np.ndarray, log_factorials: np.ndarray):
+    # With fixed margins, the probability of a table only varies with -sum(log(n_ij!))
+    return log_factorials[tables].sum(axis=(-2, -1))
+
+def _count_extreme_tables(rows: np.ndarray, columns: np.ndarray, shape: tuple[int, int], log_factorials: np.ndarray,
+                          threshold: float, size: int, seed: np.random.SeedSequence):
+    # Shuffling the column of every observation keeps both margins, a single bincount builds all the tables
+    permuted = np.random.default_rng(seed).permuted(np.tile(columns, (size, 1)), axis=1)
+    cells = np.arange(size)[:, None] * (shape[0] * shape[1]) + rows * shape[1] + permuted
+    tables = np.bincount(cells.ravel(), minlength=size * shape[0] * shape[1]).reshape(size, *shape)
+
+    return int((_table_log_weights(tables, log_factorials) >= threshold).sum())
+
+def _monte_carlo_fisher_test(table: np.ndarray, resamples: int, seed: int, workers = 1):
+    rows, columns = np.divmod(np.repeat(np.arange(table.size), table.ravel()), table.shape[1])
+
+    # No cell exceeds the number of observations, log(n!) is looked up instead of computed for every cell
+    log_factorials = special.gammaln(np.arange(len(rows) + 1) + 1)
+
+    # Tables at most as probable as the observed one, with a relative tolerance for rounding errors
+    observed = _table_log_weights(table, log_factorials)
+    threshold = observed - 1e-7 * abs(observed)
+
+    # Every batch has its own seed so that the p-value does not depend on the number of workers
+    # A resample holds its shuffled observations, then its table and the log-factorials of its cells
+    batch_size = max(1, FisherTest.BATCH_BUDGET.value // max(len(rows), table.size))
+    sizes = [min(batch_size, resamples - start) for start in range(0, resamples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    count = partial(_count_extreme_tables, rows, columns, table.shape, log_factorials, threshold)
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            extreme = sum(executor.map(count, sizes, seeds))
+    else:
+        extreme = sum(map(count, sizes, seeds))
+
+    return (extreme + 1) / (resamples + 1)
+
+def _fisher_test(table: np.ndarray, resamples = FisherTest.RESAMPLES.value, seed = FisherTest.SEED.value,
+                 workers = FisherTest.WORKERS.value):
+    if table.shape == (2, 2): return "Fisher's exact test", stats.fisher_exact(table)[1]
+
+    return "Fisher's test (Monte Carlo)", _monte_carlo_fisher_test(table, resamples, seed, workers)
+
+def _build_fisher_test(contingency_tables: ContingencyTables, tests: pd.DataFrame,
+                       field_name: str, comparison_field_name: str):
+    chi2_result = tests.loc[(field_name, comparison_field_name)]
+
+    # Pairs without papers or with a single category keep their chi-squared result
+    if pd.isna(chi2_result['p-value']) or chi2_result['dof'] == 0: return None
+
+    table = _trim_contingency_table(contingency_tables.table(field_name, comparison_field_name))
+    if not _small_expected_frequencies(table): return None
+
+    return _fisher_test(table)
+
+def _read_fisher_test(field_name: str, comparison_field_name: str, path = CLASSIFICATION_DATA_PATH):
+    return data_cache.load_fisher_test(path, 'utf8', field_name, comparison_field_name)
+
 def _comp_chi_squared_test(classification_variable: NominalVariables,
                               comparison_classification_variable: NominalVariables):
-    data = _nominal_dataframe().data
-
     variable = classification_variable.value
     comparison_variable = comparison_classification_variable.value
 
-    subset_data = _beautify_data_comp(variable.name, comparison_variable.name,
-                                      variable, comparison_variable, data)
-    
     df_title = _dataframe_get_title('Comparative', 'Chi-squared test',
                                     variable.title, comparison_variable.title)
 
     empty_df = _create_empty_dataframe(df_title, _dataframe_update_title)
 
-    if subset_data.empty: return empty_df
+    chi2_result = _read_chi_squared_tests().loc[(variable.name, comparison_variable.name)]
 
-    # Check for the condition where both variables are NaN
-    if len(subset_data) == 1 and pd.isna(subset_data[variable.name]).all()  \
-    and pd.isna(subset_data[comparison_variable.name]).all():
-        return empty_df
+    if pd.isna(chi2_result['p-value']): return empty_df
+
+    p_value = chi2_result['p-value']
 
-    # Create contingency table
-    contingency_table = pd.crosstab(subset_data[variable.name], subset_data[comparison_variable.name],
-                                     values=subset_data['Frequency'], aggfunc='sum', dropna=False).replace('', np.nan).fillna(0)
-   
-    # Calculating the Chi-squared statistic
-    chi2_result = chi2_contingency(contingency_table)
+    fisher_result = _read_fisher_test(variable.name, comparison_variable.name)
+    if fisher_result is not None:
+        statistic_name, p_value = fisher_result
+        df_title = _dataframe_get_title('Comparative', statistic_name, variable.title, comparison_variable.title)
 
     subset_data = pd.DataFrame({
-        'p-value': chi2_result.pvalue # type: ignore
+        'p-value': p_value
     }, index=[0])
 
     _dataframe_update_title(subset_data, df_title)
@@ -671,24 +1672,61 @@ def comp_chi_squared_test(classification_variable: NominalVariables,
     data = _comp_chi_squared_test(classification_variable, comparison_classification_variable)
     _display_data(data)
 
+def _comp_chi_squared_matrix(classification_variables: list[NominalVariables]):
+    tests = _read_chi_squared_tests()
+    classification_variables = list(classification_variables)
+
+    # Both orders of a pair share the same test, each pair is reported once
+    pairs = [(variable.value.name, comparison_variable.value.name)
+             for i, variable in enumerate(classification_variables)
+             for comparison_variable in classification_variables[i + 1:]]
+
+    subset_data = tests.loc[pairs].reset_index()
+    subset_data.insert(2, 'test', 'Chi-squared test')
+
+    # Pairs with small expected frequencies report Fisher's test, as comp_chi_squared_test
+    for i, pair in enumerate(pairs):
+        fisher_result = _read_fisher_test(*pair)
+        if fisher_result is None: continue
+        subset_data.loc[i, ['test', 'statistic', 'p-value']] = [fisher_result[0], np.nan, fisher_result[1]]
+
+    for column in ['variable', 'comparison variable']:
+        subset_data[column] = subset_data[column].map(lambda field_name: _get_variable(field_name, NominalVariables).title)
+
+    _dataframe_update_title(subset_data, _dataframe_get_title('Comparative', 'Chi-squared test',
+                                                              ', '.join(variable.value.title for variable in classification_variables)))
+
+    return subset_data
+
+def comp_chi_squared_matrix(classification_variables: list[NominalVariables], show: bool):
+    if not show: return
+
+    data = _comp_chi_squared_matrix(classification_variables)
+    _display_data(data)
+
 ## Shapiro Wilk's Correlation Test
 
-def _comp_shapiro_wilk_test(classification_variable: ContinuousVariables):
-    df = _continuous_dataframe().data
+def _build_shapiro_wilk_test(series: pd.Series):
+    # Test requires at least 3 samples
+    if len(series) <= 2: return
 
-    variable = classification_variable.value
+    return stats.shapiro(series.fillna(0))
 
-    subset_data = df[variable.name].replace('', np.nan).replace('', np.nan).fillna(0)
+def _read_shapiro_wilk_test(field_name: str, path = CLASSIFICATION_DATA_PATH):
+    return data_cache.load_shapiro_wilk_test(path, 'utf8', field_name)
+
+def _comp_shapiro_wilk_test(classification_variable: ContinuousVariables):
+    variable = classification_variable.value
 
     df_title = _dataframe_get_title('Comparative', "Shapiro Wilk's Correlation Test",
                                     variable.title)
     
     empty_df = _create_empty_dataframe(df_title, _dataframe_update_title)
 
-    # Test requires at least 3 samples
-    if len(subset_data) <= 2: return empty_df
+    # The normality test of a variable is shared by all of its correlation tests
+    shapiro_result = _read_shapiro_wilk_test(variable.name)
 
-    shapiro_result = shapiro(subset_data)
+    if shapiro_result is None: return empty_df
 
     statistics, pvalue =  shapiro_result
 
@@ -734,8 +1772,7 @@ def _comp_pearson_cor_test(classification_variable: ContinuousVariables,
     if not (p_value > 0.05 and dp_value > 0.05): return empty_df
     
     # Perform Pearson's correlation test
-    pearson_coefficient, p_value = pearsonr(data[variable.name].replace('', np.nan).fillna(0),
-                                             data[comparison_variable.name].replace('', np.nan).fillna(0))
+    pearson_coefficient, p_value = stats.pearsonr(data[variable.name].fillna(0), data[comparison_variable.name].fillna(0))
 
     subset_data = pd.DataFrame({
         'pearson coefficient': pearson_coefficient,
@@ -753,6 +1790,21 @@ def comp_pearson_cor_test(classification_variable: ContinuousVariables,
     data = _comp_pearson_cor_test(classification_variable, comparison_classification_variable)
     _display_data(data)
 
+def _comp_pearson_cor_matrix(classification_variables: list[ContinuousVariables]):
+    subset_data = _beautify_data_cor(list(classification_variables), ranked=False, normal=True)
+    subset_data = subset_data.rename(columns={'coefficient': 'pearson coefficient'})
+
+    _dataframe_update_title(subset_data, _dataframe_get_title('Comparative', "Pearson's Correlation Test",
+                                                              ', '.join(variable.value.title for variable in classification_variables)))
+
+    return subset_data
+
+def comp_pearson_cor_matrix(classification_variables: list[ContinuousVariables], show: bool):
+    if not show: return
+
+    data = _comp_pearson_cor_matrix(classification_variables)
+    _display_data(data)
+
 ## Spearman's Correlation Test
 
 def _comp_spearman_cor_test(classification_variable: ContinuousVariables,
@@ -780,8 +1832,7 @@ def _comp_spearman_cor_test(classification_variable: ContinuousVariables,
     if  p_value > 0.05 and dp_value > 0.05: return empty_df
 
     # Perform Spearman's correlation test
-    spearman_result = spearmanr(data[variable.name].replace('', np.nan).fillna(0),
-                                 data[comparison_variable.name].replace('', np.nan).fillna(0))
+    spearman_result = stats.spearmanr(data[variable.name].fillna(0), data[comparison_variable.name].fillna(0))
 
     subset_data = pd.DataFrame({
         'statistic': spearman_result.statistic, # type: ignore
@@ -797,4 +1848,287 @@ def comp_spearman_cor_test(classification_variable: ContinuousVariables,
     if not show: return
 
     data = _comp_spearman_cor_test(classification_variable, comparison_classification_variable)
-    _display_data(data)
\ No newline at end of file
+    _display_data(data)
+
+def _comp_spearman_cor_matrix(classification_variables: list[ContinuousVariables]):
+    subset_data = _beautify_data_cor(list(classification_variables), ranked=True, normal=False)
+    subset_data = subset_data.rename(columns={'coefficient': 'statistic'})
+
+    _dataframe_update_title(subset_data, _dataframe_get_title('Comparative', "Spearman's Correlation Test",
+                                                              ', '.join(variable.value.title for variable in classification_variables)))
+
+    return subset_data
+
+def comp_spearman_cor_matrix(classification_variables: list[ContinuousVariables], show: bool):
+    if not show: return
+
+    data = _comp_spearman_cor_matrix(classification_variables)
+    _display_data(data)
+
+### PLANNING
+
+# Dependencies on a variable or a pair of variables are formatted with the field names of the statistic,
+# normality tests gate the correlation tests of the variables and Fisher's test may replace the chi-squared test
+STATISTIC_DEPENDENCIES = {
+    'desc_frequency_table': ['frequency_tables'],
+    'desc_bar_plot': ['frequency_tables'],
+    'desc_statistics': ['continuous_dataframe', 'descriptive_statistics'],
+    'desc_box_plot': ['continuous_dataframe'],
+    'desc_violin_plot': ['continuous_dataframe'],
+    'evo_frequency_table': ['evolution_tables'],
+    'evo_cumulative_frequency_table': ['evolution_tables'],
+    'evo_rolling_frequency_table': ['evolution_tables'],
+    'evo_plot': ['evolution_tables'],
+    'comp_frequency_table': ['contingency_tables'],
+    'comp_stacked_bar_plot': ['contingency_tables'],
+    'comp_grouped_bar_plot': ['contingency_tables'],
+    'comp_bubble_chart': ['contingency_tables'],
+    'comp_chi_squared_test': ['contingency_tables', 'chi_squared_tests', 'fisher_test:{pair}'],
+    'comp_shapiro_wilk_test': ['shapiro_wilk_test:{0}'],
+    'comp_pearson_cor_test': ['continuous_dataframe', 'shapiro_wilk_test:{0}', 'shapiro_wilk_test:{1}'],
+    'comp_spearman_cor_test': ['continuous_dataframe', 'shapiro_wilk_test:{0}', 'shapiro_wilk_test:{1}']
+}
+
+def _plan_node(name: str, path: str) -> PlanNode:
+    # Streamed exports and exports updated by deltas derive their results from the counts
+    source = 'classification_counts' if data_cache._summarized(path) else 'multivalue_indexes'
+
+    if name.startswith('shapiro_wilk_test:'):
+        field_name = name.split(':', 1)[1]
+        return PlanNode(name, ['continuous_dataframe'],
+                        lambda: data_cache.load_shapiro_wilk_test(path, 'utf8', field_name))
+
+    if name.startswith('fisher_test:'):
+        field_names = name.split(':')[1:]
+        return PlanNode(name, ['contingency_tables', 'chi_squared_tests'],
+                        lambda: data_cache.load_fisher_test(path, 'utf8', *field_names))
+
+    dependencies, build = {
+        'classification_counts': ([], lambda: data_cache.load_classification_counts(path, 'utf8')),
+        'multivalue_indexes': ([], lambda: data_cache.load_multivalue_indexes(path, 'utf8')),
+        'continuous_dataframe': ([source] if source == 'classification_counts' else [], lambda:
+                                 data_cache.load_dataframe(path, 'utf8', ContinuousVariables, ContinuousDataFrame)),
+        'frequency_tables': ([source], lambda: data_cache.load_frequency_tables(path, 'utf8')),
+        'contingency_tables': ([source], lambda: data_cache.load_contingency_tables(path, 'utf8')),
+        'chi_squared_tests': (['contingency_tables'], lambda: data_cache.load_chi_squared_tests(path, 'utf8')),
+        'evolution_tables': ([source, 'continuous_dataframe'], lambda: data_cache.load_evolution_tables(path, 'utf8')),
+        'descriptive_statistics': (['continuous_dataframe'],
+                                   lambda: data_cache.load_descriptive_statistics(path, 'utf8'))
+    }[name]
+
+    return PlanNode(name, dependencies, build)
+
+def _build_execution_plan(statistics: list[tuple[str, tuple]], path = CLASSIFICATION_DATA_PATH) -> dict[str, PlanNode]:
+    names = []
+    for statistic_name, variables in statistics:
+        field_names = [variable.name for variable in variables]
+        # Both orders of a pair share the same node
+        names += [name.format(*field_names, pair=':'.join(sorted(field_names)))
+                  for name in STATISTIC_DEPENDENCIES[statistic_name.lstrip('_')]]
+
+    nodes = {}
+    while names:
+        name = names.pop()
+        if name in nodes: continue
+        nodes[name] = _plan_node(name, path)
+        names += nodes[name].dependencies
+
+    return nodes
+
+def _execute_plan(nodes: dict[str, PlanNode], workers = 1) -> pd.DataFrame:
+    sorter = TopologicalSorter({name: node.dependencies for name, node in nodes.items()})
+    sorter.prepare()
+
+    def run(node: PlanNode):
+        start = time.perf_counter()
+        node.build()
+        node.seconds = time.perf_counter() - start
+        return node
+
+    # Nodes run as soon as their dependencies are built, independent nodes in parallel threads
+    order = []
+    with ThreadPoolExecutor(workers) as executor:
+        pending = set()
+        while sorter.is_active():
+            pending |= {executor.submit(run, nodes[name]) for name in sorter.get_ready()}
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                order.append(future.result().name)
+                sorter.done(order[-1])
+
+    return pd.DataFrame([(name, ', '.join(nodes[name].dependencies), nodes[name].seconds) for name in order],
+                        columns=['node', 'dependencies', 'seconds'])
+
+def plan_statistics(statistics: list[tuple[str, tuple]], workers = 1) -> pd.DataFrame:
+    return _execute_plan(_build_execution_plan(statistics), workers)
+
+### BATCH RENDERING
+
+def _figure_plan() -> list[tuple[str, tuple]]:
+    nominal_variables, continuous_variables = list(NominalVariables), list(ContinuousVariables)
+
+    plan = [(plot_name, (variable,)) for plot_name in ('_desc_bar_plot', '_evo_plot')
+            for variable in nominal_variables]
+    plan += [(plot_name, (variable,)) for plot_name in ('_desc_box_plot', '_desc_violin_plot')
+             for variable in continuous_variables]
+    plan += [(plot_name, (variable, comparison_variable))
+             for plot_name in ('_comp_stacked_bar_plot', '_comp_grouped_bar_plot', '_comp_bubble_chart')
+             for variable in nominal_variables for comparison_variable in nominal_variables
+             if variable is not comparison_variable]
+
+    return plan
+
+def _table_plan() -> list[tuple[str, tuple]]:
+    nominal_variables, continuous_variables = list(NominalVariables), list(ContinuousVariables)
+
+    plan = [(statistic_name, (variable,))
+            for statistic_name in ('_desc_frequency_table', '_evo_frequency_table',
+                                   '_evo_cumulative_frequency_table', '_evo_rolling_frequency_table')
+            for variable in nominal_variables]
+    plan += [(statistic_name, (variable,)) for statistic_name in ('_desc_statistics', '_comp_shapiro_wilk_test')
+             for variable in continuous_variables]
+    plan += [(statistic_name, (variable, comparison_variable))
+             for statistic_name in ('_comp_frequency_table', '_comp_chi_squared_test')
+             for variable in nominal_variables for comparison_variable in nominal_variables
+             if variable is not comparison_variable]
+    plan += [(statistic_name, (variable, comparison_variable))
+             for statistic_name in ('_comp_pearson_cor_test', '_comp_spearman_cor_test')
+             for variable in continuous_variables for comparison_variable in continuous_variables
+             if variable is not comparison_variable]
+
+    return plan
+
+def _get_classification_variable(field_name: str) -> NominalVariables | ContinuousVariables:
+    if field_name in NominalVariables.__members__: return NominalVariables[field_name]
+    return ContinuousVariables[field_name]
+
+def _init_render_worker():
+    # Workers only write files, the interactive backend is never needed
+    plt.switch_backend('Agg')
+
+def _render_figure(plot_name: str, field_names: tuple[str, ...], directory: str, formats: tuple[str, ...]) -> list[str]:
+    figure = globals()[plot_name](*[_get_classification_variable(field_name) for field_name in field_names])
+
+    # Without data only the title of the plot is drawn
+    if isinstance(figure, text.Text): figure = figure.figure
+
+    base_path = os.path.join(directory, '-'.join((plot_name.lstrip('_'),) + field_names))
+
+    paths = []
+    for file_format in formats:
+        path = f'{base_path}.{file_format}'
+        figure.savefig(path, format=file_format, bbox_inches='tight')
+        paths.append(path)
+
+    return paths
+
+def render_figures(directory: str, plots: list[tuple[str, tuple]] | None = None,
+                   formats: tuple[str, ...] = ('png',), processes: int | None = None) -> list[str]:
+    tasks = [(plot_name, tuple(variable.name for variable in variables))
+             for plot_name, variables in (_figure_plan() if plots is None else plots)]
+    if not tasks: return []
+
+    os.makedirs(directory, exist_ok=True)
+
+    processes = processes or os.cpu_count() or 1
+
+    # Spawned workers would import the calling script again and build the cached results once per process,
+    # and forking where it is not the default start method (e.g. macOS) is unsafe, the figures are rendered serially
+    if multiprocessing.get_start_method() != 'fork': processes = 1
+
+    # Forked workers inherit the cached results
+    plan_statistics(_figure_plan() if plots is None else plots, processes)
+
+    render = partial(_render_figure, directory=directory, formats=tuple(formats))
+    plot_names, field_names = zip(*tasks)
+
+    if processes == 1:
+        paths = list(map(render, plot_names, field_names))
+        figure_pool.close()
+    else:
+        # Batches of figures per worker amortize the inter-process communication
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('fork'),
+                                 initializer=_init_render_worker) as executor:
+            paths = list(executor.map(render, plot_names, field_names,
+                                      chunksize=max(1, len(tasks) // (4 * processes))))
+
+    return [path for figure_paths in paths for path in figure_paths]
+
+### REPORT
+
+def _statistic_file_name(statistic_name: str, field_names: tuple[str, ...]) -> str:
+    return '-'.join((statistic_name.lstrip('_'),) + field_names)
+
+def _write_table(statistic_name: str, field_names: tuple[str, ...], directory: str) -> tuple[str, str]:
+    data = globals()[statistic_name](*[_get_classification_variable(field_name) for field_name in field_names])
+
+    path = os.path.join(directory, f'{_statistic_file_name(statistic_name, field_names)}.csv')
+    data.to_csv(path, index=False)
+
+    section = data.to_markdown() if data.size != 0 else _no_data_message()
+    return path, f"## {data.attrs.get('title', statistic_name.lstrip('_'))}\n\n{section}\n"
+
+def run_report(directory: str, statistics: list[str] | None = None,
+               formats: tuple[str, ...] = ('png',), processes: int | None = None) -> list[str]:
+    # The same plan as the playground, every statistic of every variable and pair of variables
+    selected = lambda plan: [(statistic_name, variables) for statistic_name, variables in plan
+                             if statistics is None or statistic_name.lstrip('_') in statistics]
+    tables, figures = selected(_table_plan()), selected(_figure_plan())
+
+    os.makedirs(directory, exist_ok=True)
+
+    # Intermediate results shared by the statistics are built once and cached
+    timings = plan_statistics(tables + figures, processes or os.cpu_count() or 1)
+
+    paths, sections = [], []
+    for statistic_name, variables in tables:
+        path, section = _write_table(statistic_name, tuple(variable.name for variable in variables), directory)
+        paths.append(path)
+        sections.append(section)
+
+    figure_paths = render_figures(directory, figures, formats, processes)
+    paths += figure_paths
+
+    sections += [f'![{os.path.splitext(os.path.basename(path))[0]}]({os.path.basename(path)})\n'
+                 for path in figure_paths[::len(formats)]]
+
+    timings_path = os.path.join(directory, 'timings.csv')
+    timings.to_csv(timings_path, index=False)
+
+    report_path = os.path.join(directory, 'report.md')
+    with open(report_path, 'w', encoding='utf8') as file:
+        file.write('\n'.join(sections))
+
+    return paths + [timings_path, report_path]
+
+def _statistic_names() -> list[str]:
+    return sorted({statistic_name.lstrip('_') for statistic_name, _ in _table_plan() + _figure_plan()})
+
+def _parse_arguments(arguments: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='relis_statistics_kernel',
+                                     description='Statistical analysis of a ReLiS classification export')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='write the tables and figures of the statistics to a directory')
+    selection = run.add_mutually_exclusive_group(required=True)
+    selection.add_argument('--all', action='store_true', help='run every statistic')
+    selection.add_argument('--statistics', nargs='+', choices=_statistic_names(), metavar='STATISTIC',
+                           help=f"statistics to run among {', '.join(_statistic_names())}")
+    run.add_argument('--out', default='report', help='output directory')
+    run.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg', 'pdf'], help='figure formats')
+    run.add_argument('--processes', type=int, help='number of processes rendering the figures')
+
+    return parser.parse_args(arguments)
+
+def main(arguments: list[str] | None = None):
+    arguments = _parse_arguments(arguments)
+
+    # Nothing is displayed, the report is only written to files
+    plt.switch_backend('Agg')
+
+    paths = run_report(arguments.out, None if arguments.all else arguments.statistics,
+                       tuple(arguments.formats), arguments.processes)
+    print(f'{len(paths)} files written to {arguments.out}')
+
+if __name__ == '__main__':
+    main()